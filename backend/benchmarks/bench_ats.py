@@ -0,0 +1,187 @@
+"""
+ATS ranking benchmarks
+Usage (from the backend directory):
+    python -m benchmarks.bench_ats
+    python -m benchmarks.bench_ats --sizes 1000 10000 100000 --repeat 5 --seed 42
+    python -m benchmarks.bench_ats --only micro
+
+Runs offline against synthetic documents from benchmarks.generator. First
+asserts that batch rankings equal calculate_ats_ranking() exactly, then
+reports throughput and p50/p99 latency for:
+  * micro: each calculate_*_match function, per call
+  * ranking: ranking one job against N candidates via the scalar loop,
+    the batch engine, the process-pool path and the talent-pool index
+"""
+
+from typing import Callable, List
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from benchmarks.generator import generate_profiles, generate_jobs
+from utils.ats_ranking import (
+    calculate_skills_match,
+    calculate_experience_match,
+    calculate_location_match,
+    calculate_education_match,
+    calculate_ats_ranking,
+    calculate_ats_ranking_batch
+)
+from utils.ats_features import build_ats_features
+from utils.ats_index import CandidateIndex
+from utils import ats_parallel
+
+def _percentile(samples: List[float], percent: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def _format_duration(seconds: float) -> str:
+    if seconds < 1e-3:
+        return f'{seconds * 1e6:.1f}µs'
+    if seconds < 1:
+        return f'{seconds * 1e3:.2f}ms'
+    return f'{seconds:.2f}s'
+
+def _report(name: str, samples: List[float], items_per_sample: int, unit: str):
+    total = sum(samples)
+    throughput = (items_per_sample * len(samples)) / total if total else float('inf')
+    print(
+        f'  {name:<38} {throughput:>14,.0f} {unit}/s'
+        f'   p50 {_format_duration(_percentile(samples, 50)):>10}'
+        f'   p99 {_format_duration(_percentile(samples, 99)):>10}'
+    )
+
+def _time_calls(func: Callable, arguments: List[tuple]) -> List[float]:
+    samples = []
+    for args in arguments:
+        start = time.perf_counter()
+        func(*args)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def run_micro_benchmarks(calls: int, seed: int):
+    """Per-call latency of each ATS sub-score function"""
+    profiles = generate_profiles(calls, seed)
+    jobs = generate_jobs(calls, seed)
+    pairs = list(zip(jobs, profiles))
+    
+    print(f'\nMicro-benchmarks ({calls:,} calls each)')
+    _report('calculate_skills_match', _time_calls(calculate_skills_match, [
+        (job.get('required_skills', []), profile.get('primary_skills', [])) for job, profile in pairs
+    ]), 1, 'calls')
+    _report('calculate_experience_match', _time_calls(calculate_experience_match, [
+        (job.get('min_experience', 0), profile.get('experience_years', 0)) for job, profile in pairs
+    ]), 1, 'calls')
+    _report('calculate_location_match', _time_calls(calculate_location_match, [
+        (job.get('location', ''), profile.get('preferred_locations', []), profile.get('willing_to_relocate', False))
+        for job, profile in pairs
+    ]), 1, 'calls')
+    _report('calculate_education_match', _time_calls(calculate_education_match, [
+        (job.get('education_required'), profile.get('education')) for job, profile in pairs
+    ]), 1, 'calls')
+    _report('calculate_ats_ranking', _time_calls(calculate_ats_ranking, pairs), 1, 'calls')
+    _report('build_ats_features', _time_calls(build_ats_features, [(profile,) for profile in profiles]), 1, 'calls')
+
+def _time_repeated(func: Callable, repeat: int) -> List[float]:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def check_batch_matches_scalar(seed: int, jobs: int = 20, candidates: int = 2000):
+    """
+    Assert the batch engine returns exactly what calculate_ats_ranking()
+    returns, from raw profiles and from precomputed features
+    """
+    profiles = generate_profiles(candidates, seed)
+    projected = [{'user_id': profile['user_id'], 'ats_features': build_ats_features(profile)} for profile in profiles]
+    
+    for job in generate_jobs(jobs, seed):
+        expected = [calculate_ats_ranking(job, profile) for profile in profiles]
+        assert calculate_ats_ranking_batch(job, profiles) == expected, \
+            f"Batch ranking of raw profiles differs from calculate_ats_ranking for job {job['id']}"
+        assert calculate_ats_ranking_batch(job, projected) == expected, \
+            f"Batch ranking of precomputed features differs from calculate_ats_ranking for job {job['id']}"
+    
+    print(f'\nBatch results match calculate_ats_ranking ({jobs} jobs x {candidates:,} candidates)')
+
+def run_ranking_benchmarks(sizes: List[int], repeat: int, seed: int, scalar_limit: int):
+    """End-to-end ranking of one job against N candidates"""
+    job = next(job for job in generate_jobs(50, seed) if job['required_skills'])
+    
+    for size in sizes:
+        profiles = generate_profiles(size, seed)
+        projected = [{'user_id': profile['user_id'], 'ats_features': build_ats_features(profile)} for profile in profiles]
+        
+        print(f'\nRanking 1 job against {size:,} candidates ({repeat} runs)')
+        
+        if size <= scalar_limit:
+            _report('scalar loop (raw profiles)', _time_repeated(
+                lambda: sorted((calculate_ats_ranking(job, profile) for profile in profiles),
+                               key=lambda result: result['overall_score'], reverse=True),
+                repeat
+            ), size, 'candidates')
+        else:
+            print(f'  {"scalar loop (raw profiles)":<38} skipped (> --scalar-limit {scalar_limit:,})')
+        
+        _report('batch (raw profiles)', _time_repeated(
+            lambda: calculate_ats_ranking_batch(job, profiles), repeat
+        ), size, 'candidates')
+        _report('batch (precomputed features)', _time_repeated(
+            lambda: calculate_ats_ranking_batch(job, projected), repeat
+        ), size, 'candidates')
+        
+        # Force the process-pool path regardless of the configured threshold
+        threshold = ats_parallel.ATS_PROCESS_POOL_THRESHOLD
+        ats_parallel.ATS_PROCESS_POOL_THRESHOLD = 0
+        try:
+            asyncio.run(ats_parallel.rank_candidates(job, projected[:1]))  # warm up workers
+            _report('process pool, top 50', _time_repeated(
+                lambda: asyncio.run(ats_parallel.rank_candidates(job, projected, top_k=50)), repeat
+            ), size, 'candidates')
+        finally:
+            ats_parallel.ATS_PROCESS_POOL_THRESHOLD = threshold
+            ats_parallel.shutdown_process_pool()
+        
+        index = CandidateIndex()
+        for candidate in projected:
+            index.update(candidate['user_id'], candidate['ats_features'])
+        scored = []
+        
+        def query_index():
+            _, candidates_scored = index.top_k(job, 50)
+            scored.append(candidates_scored)
+        
+        _report('talent-pool index, top 50', _time_repeated(query_index, repeat), size, 'candidates')
+        print(f'  {"":<38} scored {statistics.mean(scored):,.0f} of {size:,} candidates per query')
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description='ATS ranking benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='candidate counts for the ranking benchmarks')
+    parser.add_argument('--repeat', type=int, default=5, help='runs per ranking benchmark')
+    parser.add_argument('--calls', type=int, default=20000, help='calls per micro-benchmark')
+    parser.add_argument('--seed', type=int, default=42, help='seed for the synthetic data')
+    parser.add_argument('--scalar-limit', type=int, default=100000,
+                        help='skip the scalar loop above this many candidates')
+    parser.add_argument('--only', choices=['micro', 'ranking'], help='run only one group')
+    args = parser.parse_args(argv)
+    
+    random.seed(args.seed)
+    check_batch_matches_scalar(args.seed)
+    if args.only != 'ranking':
+        run_micro_benchmarks(args.calls, args.seed)
+    if args.only != 'micro':
+        run_ranking_benchmarks(args.sizes, args.repeat, args.seed, args.scalar_limit)
+
+if __name__ == '__main__':
+    main()
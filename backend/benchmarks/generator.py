@@ -0,0 +1,131 @@
+"""
+Seeded generator of synthetic jobseeker_profiles and jobs documents
+Produces documents with the same shape the routes store, so benchmarks
+exercise the real ATS code paths without a database
+"""
+
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+import random
+import uuid
+
+SKILLS = [
+    'Python', 'JavaScript', 'TypeScript', 'Java', 'Go', 'Rust', 'C++', 'C#', 'Ruby', 'PHP',
+    'Kotlin', 'Swift', 'SQL', 'PostgreSQL', 'MySQL', 'MongoDB', 'Redis', 'Elasticsearch',
+    'React', 'Next.js', 'Angular', 'Vue', 'Node.js', 'Django', 'FastAPI', 'Flask', 'Spring Boot',
+    'AWS', 'Azure', 'GCP', 'Docker', 'Kubernetes', 'Terraform', 'Linux', 'Git', 'CI/CD',
+    'Machine Learning', 'Data Analysis', 'Pandas', 'NumPy', 'TensorFlow', 'PyTorch', 'Spark',
+    'Kafka', 'GraphQL', 'REST APIs', 'Microservices', 'HTML', 'CSS', 'Tailwind', 'Figma',
+    'Selenium', 'Jest', 'Pytest', 'Agile', 'Scrum', 'Excel', 'Power BI', 'Tableau', 'SAP'
+]
+
+LOCATIONS = [
+    'Bangalore', 'Mumbai', 'Delhi', 'Hyderabad', 'Chennai', 'Pune', 'Kolkata', 'Noida',
+    'Gurgaon', 'Ahmedabad', 'Bangalore, Karnataka', 'Mumbai, Maharashtra', 'Remote',
+    'New York', 'New York, NY', 'London', 'Singapore', 'Dubai'
+]
+
+DEGREES = [
+    'High School', 'Diploma in Computer Engineering', 'Associate Degree',
+    'Bachelor of Technology', 'Bachelor of Science', 'Bachelor of Commerce',
+    "Master's in Computer Science", 'Master of Business Administration',
+    'PhD in Machine Learning', 'Doctorate in Physics', 'B.Tech', 'MBA'
+]
+
+EDUCATION_REQUIREMENTS = [
+    None, None, "Bachelor's degree", 'Bachelor of Technology or equivalent',
+    "Master's degree preferred", 'PhD', 'Diploma or higher', 'Any graduate'
+]
+
+FIRST_NAMES = ['Aarav', 'Vivaan', 'Aditya', 'Diya', 'Ananya', 'Ishaan', 'Meera', 'Rohan', 'Sara', 'Kabir']
+LAST_NAMES = ['Sharma', 'Verma', 'Iyer', 'Reddy', 'Patel', 'Gupta', 'Nair', 'Singh', 'Das', 'Khan']
+POSITIONS = ['Software Engineer', 'Senior Developer', 'Data Analyst', 'DevOps Engineer',
+             'Product Designer', 'QA Engineer', 'Engineering Manager', 'Data Scientist']
+JOB_TYPES = ['full-time', 'part-time', 'contract', 'internship']
+WORK_MODES = ['onsite', 'remote', 'hybrid']
+
+# Popular skills show up far more often than niche ones
+_SKILL_WEIGHTS = [1.0 / (rank + 1) ** 0.8 for rank in range(len(SKILLS))]
+
+def _pick_skills(rng: random.Random, count: int) -> List[str]:
+    picked = []
+    while len(picked) < count:
+        skill = rng.choices(SKILLS, weights=_SKILL_WEIGHTS)[0]
+        if skill not in picked:
+            picked.append(skill)
+    return picked
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+def generate_profile(rng: random.Random) -> Dict:
+    """Generate one jobseeker_profiles document"""
+    now = datetime(2025, 1, 1) + timedelta(minutes=rng.randint(0, 500000))
+    education = [
+        {
+            'institution': f'Institute {rng.randint(1, 500)}',
+            'degree': rng.choice(DEGREES),
+            'field_of_study': rng.choice(['Computer Science', 'Electronics', 'Commerce', 'Mathematics']),
+            'start_year': 2005 + rng.randint(0, 15),
+            'end_year': 2009 + rng.randint(0, 15)
+        }
+        for _ in range(rng.choice([0, 1, 1, 2, 2, 3]))
+    ]
+    return {
+        'id': _uuid(rng),
+        'user_id': _uuid(rng),
+        'first_name': rng.choice(FIRST_NAMES),
+        'last_name': rng.choice(LAST_NAMES),
+        'current_position': rng.choice(POSITIONS),
+        'primary_skills': _pick_skills(rng, rng.randint(0, 12)),
+        'experience_years': rng.choice([0, 1, 2, 3, 4, 5, 6, 8, 10, 12, 15]),
+        'preferred_locations': rng.sample(LOCATIONS, rng.randint(0, 3)),
+        'willing_to_relocate': rng.random() < 0.2,
+        'education': education,
+        'job_search_status': rng.choice(['actively_looking', 'open_to_offers', 'not_looking']),
+        'verification_count': rng.randint(0, 3),
+        'overall_rating': rng.choice([None, 3.5, 4.0, 4.5]),
+        'is_profile_complete': rng.random() < 0.7,
+        'created_at': now,
+        'updated_at': now
+    }
+
+def generate_job(rng: random.Random, employer_id: Optional[str] = None) -> Dict:
+    """Generate one jobs document"""
+    now = datetime(2025, 1, 1) + timedelta(minutes=rng.randint(0, 500000))
+    min_experience = rng.choice([0, 0, 1, 2, 3, 5, 7])
+    min_salary = rng.choice([None, 300000, 600000, 1200000, 2500000])
+    return {
+        'id': _uuid(rng),
+        'employer_id': employer_id or _uuid(rng),
+        'company_name': f'Company {rng.randint(1, 2000)}',
+        'job_title': f'{rng.choice(POSITIONS)}',
+        'job_type': rng.choice(JOB_TYPES),
+        'location': rng.choice(LOCATIONS),
+        'work_mode': rng.choice(WORK_MODES),
+        'description': 'Synthetic job description for benchmarking.',
+        'required_skills': _pick_skills(rng, rng.randint(0, 8)),
+        'preferred_skills': _pick_skills(rng, rng.randint(0, 4)),
+        'min_experience': min_experience,
+        'max_experience': min_experience + rng.choice([2, 3, 5]),
+        'education_required': rng.choice(EDUCATION_REQUIREMENTS),
+        'min_salary': min_salary,
+        'max_salary': min_salary * 2 if min_salary else None,
+        'number_of_openings': rng.randint(1, 5),
+        'status': rng.choice(['active'] * 9 + ['closed']),
+        'applications_count': 0,
+        'views_count': 0,
+        'revision': 0,
+        'created_at': now,
+        'updated_at': now
+    }
+
+def generate_profiles(count: int, seed: int = 42) -> List[Dict]:
+    """Generate `count` profiles; the same seed always yields the same documents"""
+    rng = random.Random(seed)
+    return [generate_profile(rng) for _ in range(count)]
+
+def generate_jobs(count: int, seed: int = 42) -> List[Dict]:
+    """Generate `count` jobs; the same seed always yields the same documents"""
+    rng = random.Random(seed + 1)
+    return [generate_job(rng) for _ in range(count)]
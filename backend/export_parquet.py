@@ -0,0 +1,58 @@
+"""
+Parquet Export Script
+Exports new credit_transactions, contact_access, interview_ratings and
+login_history rows (since the last run) to date-partitioned Parquet files;
+meant to run nightly from cron
+Usage: python export_parquet.py [collection ...]
+"""
+import asyncio
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+import sys
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+async def export_parquet(collections):
+    """Export new rows of the given collections (default: all exportable ones)"""
+    from utils.parquet_export import export_collections, EXPORT_SOURCES, EXPORT_DIR
+    
+    print("=" * 60)
+    print("TalentHub - Parquet Export")
+    print("=" * 60)
+    
+    unknown = [collection for collection in collections if collection not in EXPORT_SOURCES]
+    if unknown:
+        print(f"\n❌ Error: Not exportable: {', '.join(unknown)} (choose from {', '.join(EXPORT_SOURCES)})")
+        sys.exit(1)
+    
+    try:
+        mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+        db_name = os.environ.get('DB_NAME', 'talenthub')
+        
+        print(f"\n🔌 Connecting to MongoDB: {mongo_url}")
+        client = AsyncIOMotorClient(mongo_url)
+        db = client[db_name]
+        
+        print(f"📁 Export directory: {EXPORT_DIR}")
+        exports = await export_collections(db, collections or None)
+        
+        for export in exports:
+            partitions = ', '.join(export['partitions']) or 'no new rows'
+            print(f"  - {export['collection']}: {export['rows']} rows, {len(export['files'])} files ({partitions})")
+        
+        print(f"\n✅ Success: Exported {sum(export['rows'] for export in exports)} rows")
+        
+        client.close()
+        
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(export_parquet(sys.argv[1:]))
@@ -0,0 +1,73 @@
+"""
+Index Management Script
+Compares the indexes declared in utils/indexes.py with the database
+Usage: python manage_indexes.py [--apply]
+"""
+import asyncio
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+import sys
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+STATUS_ICONS = {
+    'ok': '✅',
+    'created': '🆕',
+    'missing': '❌',
+    'failed': '❌',
+    'conflict': '⚠️ ',
+    'extra': 'ℹ️ '
+}
+
+async def manage_indexes(apply: bool):
+    """Print the index report, creating missing indexes if apply is set"""
+    from utils.indexes import ensure_indexes
+    
+    print("=" * 60)
+    print(f"TalentHub - Index {'Sync' if apply else 'Report (dry run)'}")
+    print("=" * 60)
+    
+    try:
+        mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+        db_name = os.environ.get('DB_NAME', 'talenthub')
+        
+        print(f"\n🔌 Connecting to MongoDB: {mongo_url}")
+        client = AsyncIOMotorClient(mongo_url)
+        db = client[db_name]
+        
+        report = await ensure_indexes(db, dry_run=not apply)
+        
+        collection = None
+        for entry in report:
+            if entry['collection'] != collection:
+                collection = entry['collection']
+                print(f"\n{collection}")
+            line = f"  {STATUS_ICONS.get(entry['status'], '')} {entry['status']:<9} {entry['name']}"
+            if entry['status'] == 'conflict':
+                line += f" (existing '{entry['existing_name']}' differs in: {', '.join(entry['differing_options'])})"
+            if entry['status'] == 'failed':
+                line += f" ({entry['error']})"
+            print(line)
+        
+        missing = sum(1 for entry in report if entry['status'] in ('missing', 'failed', 'conflict'))
+        if missing:
+            print(f"\n⚠️  Warning: {missing} declared indexes are missing or differ")
+            if not apply:
+                print("Run with --apply to create the missing ones")
+        else:
+            print("\n✅ Success: All declared indexes are in place")
+        
+        client.close()
+        
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(manage_indexes('--apply' in sys.argv[1:]))
@@ -27,6 +27,7 @@ class Job(BaseModel):
     responsibilities: List[str] = []
     requirements: List[str] = []
     required_skills: List[str] = []
+    required_skill_ids: List[int] = []  # interned IDs of required_skills (skill dictionary)
     preferred_skills: List[str] = []
     min_experience: float = 0
     max_experience: Optional[float] = None
@@ -36,6 +37,7 @@ class Job(BaseModel):
     status: str = "active"  # active, closed, draft
     applications_count: int = 0
     views_count: int = 0
+    revision: int = 0  # incremented on every update (ATS score cache key)
     freshness_days: int = 0  # calculated from created_at
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
@@ -85,6 +87,16 @@ class JobApplication(BaseModel):
     applied_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     notes: Optional[str] = None  # Employer notes
+    ats_score: Optional[float] = None  # Mirrored from the job's ATS ranking
+    
+    # Denormalized summaries (kept in sync by utils/application_summaries.py)
+    job_title: Optional[str] = None
+    company_name: Optional[str] = None
+    location: Optional[str] = None
+    applicant_name: Optional[str] = None
+    applicant_headline: Optional[str] = None
+    applicant_location: Optional[str] = None
+    applicant_experience: Optional[float] = None
 
 class JobApplicationCreate(BaseModel):
     job_id: str
@@ -93,3 +105,8 @@ class JobApplicationCreate(BaseModel):
 class JobApplicationUpdate(BaseModel):
     status: str
     notes: Optional[str] = None
+
+class JobApplicationBulkUpdate(BaseModel):
+    application_ids: List[str]
+    status: Optional[str] = None
+    notes: Optional[str] = None
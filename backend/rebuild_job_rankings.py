@@ -0,0 +1,62 @@
+"""
+Rebuild Job Rankings Script
+Regenerates the materialized ATS ranking of every job from scratch
+Usage: python rebuild_job_rankings.py [job_id ...]
+"""
+import asyncio
+import os
+from pathlib import Path
+from dotenv import load_dotenv
+from motor.motor_asyncio import AsyncIOMotorClient
+import sys
+
+# Load environment variables
+ROOT_DIR = Path(__file__).parent
+load_dotenv(ROOT_DIR / '.env')
+
+async def rebuild_job_rankings(job_ids):
+    """Rebuild job rankings (all jobs, or only the given ones)"""
+    from utils.indexes import ensure_indexes
+    from utils.job_rankings import rebuild_job_ranking, rebuild_all_rankings
+    
+    print("=" * 60)
+    print("TalentHub - Rebuild Job Rankings")
+    print("=" * 60)
+    
+    try:
+        mongo_url = os.environ.get('MONGO_URL', 'mongodb://localhost:27017')
+        db_name = os.environ.get('DB_NAME', 'talenthub')
+        
+        print(f"\n🔌 Connecting to MongoDB: {mongo_url}")
+        client = AsyncIOMotorClient(mongo_url)
+        db = client[db_name]
+        
+        await ensure_indexes(db, collections=['job_rankings'])
+        
+        if job_ids:
+            jobs = await db.jobs.find({'id': {'$in': job_ids}}, {'_id': 0}).to_list(None)
+            missing = set(job_ids) - {job['id'] for job in jobs}
+            for job_id in sorted(missing):
+                print(f"⚠️  Warning: Job '{job_id}' not found, skipped")
+            
+            entries = 0
+            for job in jobs:
+                written = await rebuild_job_ranking(db, job)
+                print(f"  - {job['id']} ({job.get('job_title', '')}): {written} applicants ranked")
+                entries += written
+            jobs_ranked = len(jobs)
+        else:
+            jobs_ranked, entries = await rebuild_all_rankings(db)
+        
+        print(f"\n✅ Success: Rebuilt rankings for {jobs_ranked} jobs ({entries} entries)")
+        
+        client.close()
+        
+    except Exception as e:
+        print(f"\n❌ Error: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_job_rankings(sys.argv[1:]))
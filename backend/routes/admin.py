@@ -12,11 +12,12 @@ from models_credit_interview import (
     CustomCodeUpdate,
     CreditDonation,
     CreditDonationCreate,
-    CreditTransactionExtended,
     TransactionType,
     TransactionCategory
 )
 from routes.auth import get_current_user
+from utils.credit_ledger import add_credits, CreditAccountNotFoundError
+from utils.parquet_export import export_collections, export_lock, EXPORT_SOURCES
 
 router = APIRouter()
 
@@ -381,20 +382,7 @@ async def donate_credits_to_user(
     if donation_data.amount <= 0:
         raise HTTPException(status_code=400, detail='Amount must be positive')
     
-    # Get user
-    user = await db.users.find_one({'id': user_id})
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
-    
-    # Add credits
-    new_free_balance = user.get('credits_free', 0) + donation_data.amount
-    
-    await db.users.update_one(
-        {'id': user_id},
-        {'$set': {'credits_free': new_free_balance}}
-    )
-    
-    # Create donation record
+    # Donation record (inserted once the credits are added)
     import uuid
     donation = CreditDonation(
         id=str(uuid.uuid4()),
@@ -405,23 +393,23 @@ async def donate_credits_to_user(
         notification_sent=donation_data.send_notification
     )
     
-    await db.credit_donations.insert_one(donation.model_dump())
-    
-    # Create transaction record
-    transaction = CreditTransactionExtended(
-        user_id=user_id,
-        amount=donation_data.amount,
-        transaction_type=TransactionType.BONUS,
-        category=TransactionCategory.ADMIN_ADJUSTMENT,
-        description=donation_data.reason or f'Credit donation from admin',
-        reference_id=donation.id,
-        reference_type='donation',
-        balance_free=new_free_balance,
-        balance_paid=user.get('credits_paid', 0),
-        created_by=current_user.id
-    )
+    # Add credits
+    try:
+        balance = await add_credits(
+            db,
+            user_id,
+            donation_data.amount,
+            TransactionType.BONUS,
+            TransactionCategory.ADMIN_ADJUSTMENT,
+            donation_data.reason or f'Credit donation from admin',
+            reference_id=donation.id,
+            reference_type='donation',
+            created_by=current_user.id
+        )
+    except CreditAccountNotFoundError:
+        raise HTTPException(status_code=404, detail='User not found')
     
-    await db.credit_transactions.insert_one(transaction.model_dump())
+    await db.credit_donations.insert_one(donation.model_dump())
     
     # Create user-specific notification if requested
     if donation_data.send_notification:
@@ -445,11 +433,7 @@ async def donate_credits_to_user(
     return {
         'message': 'Credits donated successfully',
         'donation': donation,
-        'new_balance': {
-            'free': new_free_balance,
-            'paid': user.get('credits_paid', 0),
-            'total': new_free_balance + user.get('credits_paid', 0)
-        }
+        'new_balance': balance
     }
 
 
@@ -478,3 +462,50 @@ async def get_all_donations(
     donations = await db.credit_donations.find({}).sort('created_at', -1).to_list(500)
     
     return [CreditDonation(**d) for d in donations]
+
+
+# ==================== Data Exports ====================
+
+@router.post('/exports/parquet')
+async def export_parquet(
+    collections: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Admin: Export new ledger/activity rows to date-partitioned Parquet files"""
+    if not current_user or current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail='Admin access required')
+    
+    collection_list = [c.strip() for c in collections.split(',')] if collections else list(EXPORT_SOURCES)
+    unknown = [c for c in collection_list if c not in EXPORT_SOURCES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f'Collections not exportable: {", ".join(unknown)}')
+    
+    if export_lock.locked():
+        raise HTTPException(status_code=409, detail='An export is already running')
+    
+    async with export_lock:
+        try:
+            exports = await export_collections(db, collection_list)
+        except RuntimeError as e:
+            raise HTTPException(status_code=503, detail=str(e))
+    
+    return {
+        'message': f'Exported {sum(e["rows"] for e in exports)} rows',
+        'exports': exports
+    }
+
+
+@router.get('/exports/state')
+async def get_export_state(
+    current_user: User = Depends(get_current_user)
+):
+    """Admin: High-water marks of the Parquet exports"""
+    if not current_user or current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail='Admin access required')
+    
+    states = await db.export_state.find({}, {'cursor': 0}).to_list(None)
+    
+    return [
+        {'collection': state.pop('_id'), **state}
+        for state in states
+    ]
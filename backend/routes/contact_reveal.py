@@ -7,11 +7,11 @@ from models_credit_interview import (
     ContactAccess,
     ContactAccessCreate,
     PlatformSettings,
-    CreditTransactionExtended,
     TransactionType,
     TransactionCategory
 )
 from routes.auth import get_current_user
+from utils.credit_ledger import deduct_credits, CreditAccountNotFoundError, InsufficientCreditsError
 
 router = APIRouter()
 
@@ -74,37 +74,7 @@ async def reveal_contact(
         if len(jobseeker_profile['work_experience']) > 0:
             current_company = jobseeker_profile['work_experience'][0].get('company_name')
     
-    # Check employer has enough credits
-    employer = await db.users.find_one({'id': current_user.id})
-    total_credits = employer.get('credits_free', 0) + employer.get('credits_paid', 0)
-    
-    if total_credits < cost:
-        raise HTTPException(
-            status_code=400,
-            detail=f'Insufficient credits. Required: {cost}, Available: {total_credits}'
-        )
-    
-    # Deduct credits (paid first, then free)
-    credits_paid = employer.get('credits_paid', 0)
-    credits_free = employer.get('credits_free', 0)
-    
-    remaining_to_deduct = cost
-    new_paid = credits_paid
-    new_free = credits_free
-    
-    if credits_paid >= remaining_to_deduct:
-        new_paid = credits_paid - remaining_to_deduct
-    else:
-        new_paid = 0
-        remaining_to_deduct -= credits_paid
-        new_free = credits_free - remaining_to_deduct
-    
-    await db.users.update_one(
-        {'id': current_user.id},
-        {'$set': {'credits_paid': new_paid, 'credits_free': new_free}}
-    )
-    
-    # Create contact access record
+    # Contact access record (inserted once the credits are paid)
     import uuid
     access_expires_at = datetime.utcnow() + timedelta(days=duration_days)
     
@@ -119,31 +89,29 @@ async def reveal_contact(
         revealed_current_company=current_company
     )
     
-    await db.contact_access.insert_one(contact_access.model_dump())
-    
-    # Create transaction record
-    transaction = CreditTransactionExtended(
-        user_id=current_user.id,
-        amount=-cost,
-        transaction_type=TransactionType.SPEND,
-        category=TransactionCategory.CONTACT_REVEAL,
-        description=f'Revealed contact for job seeker {jobseeker["email"]}',
-        reference_id=contact_access.id,
-        reference_type='contact_access',
-        balance_free=new_free,
-        balance_paid=new_paid
-    )
+    # Deduct credits (paid first, then free)
+    try:
+        balance = await deduct_credits(
+            db,
+            current_user.id,
+            cost,
+            TransactionType.SPEND,
+            TransactionCategory.CONTACT_REVEAL,
+            f'Revealed contact for job seeker {jobseeker["email"]}',
+            reference_id=contact_access.id,
+            reference_type='contact_access'
+        )
+    except CreditAccountNotFoundError:
+        raise HTTPException(status_code=404, detail='User not found')
+    except InsufficientCreditsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    await db.credit_transactions.insert_one(transaction.model_dump())
+    await db.contact_access.insert_one(contact_access.model_dump())
     
     return {
         'message': 'Contact revealed successfully',
         'access': contact_access,
-        'remaining_credits': {
-            'free': new_free,
-            'paid': new_paid,
-            'total': new_free + new_paid
-        }
+        'remaining_credits': balance
     }
 
 
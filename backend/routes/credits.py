@@ -2,8 +2,6 @@ from fastapi import APIRouter, HTTPException, Depends, Query
 from fastapi.responses import StreamingResponse
 from typing import Optional, List
 from datetime import datetime, timedelta
-import csv
-import io
 
 from models import User, UserRole
 from models_credit_interview import (
@@ -38,6 +36,8 @@ def convert_legacy_transaction(t):
     
     return CreditTransactionExtended(**legacy_data)
 from routes.auth import get_current_user
+from utils.csv_stream import stream_csv
+from utils.credit_ledger import add_credits, deduct_credits, CreditAccountNotFoundError, InsufficientCreditsError
 
 router = APIRouter()
 
@@ -129,42 +129,25 @@ async def admin_add_credits(
     if amount <= 0:
         raise HTTPException(status_code=400, detail='Amount must be positive')
     
-    # Get user
-    user = await db.users.find_one({'id': user_id})
-    if not user:
-        raise HTTPException(status_code=404, detail='User not found')
-    
     # Add credits (as free credits)
-    new_free_balance = user.get('credits_free', 0) + amount
-    
-    await db.users.update_one(
-        {'id': user_id},
-        {'$set': {'credits_free': new_free_balance}}
-    )
-    
-    # Create transaction record
-    transaction = CreditTransactionExtended(
-        user_id=user_id,
-        amount=amount,
-        transaction_type=TransactionType.ADMIN_ADD,
-        category=TransactionCategory.ADMIN_ADJUSTMENT,
-        description=description,
-        balance_free=new_free_balance,
-        balance_paid=user.get('credits_paid', 0),
-        created_by=current_user.id
-    )
-    
-    await db.credit_transactions.insert_one(transaction.model_dump())
+    try:
+        balance = await add_credits(
+            db,
+            user_id,
+            amount,
+            TransactionType.ADMIN_ADD,
+            TransactionCategory.ADMIN_ADJUSTMENT,
+            description,
+            created_by=current_user.id
+        )
+    except CreditAccountNotFoundError:
+        raise HTTPException(status_code=404, detail='User not found')
     
     return {
         'message': 'Credits added successfully',
         'user_id': user_id,
         'amount_added': amount,
-        'new_balance': {
-            'free': new_free_balance,
-            'paid': user.get('credits_paid', 0),
-            'total': new_free_balance + user.get('credits_paid', 0)
-        }
+        'new_balance': balance
     }
 
 
@@ -182,79 +165,44 @@ async def admin_deduct_credits(
     if amount <= 0:
         raise HTTPException(status_code=400, detail='Amount must be positive')
     
-    # Get user
-    user = await db.users.find_one({'id': user_id})
-    if not user:
+    # Deduct from paid first, then free
+    try:
+        balance = await deduct_credits(
+            db,
+            user_id,
+            amount,
+            TransactionType.ADMIN_DEDUCT,
+            TransactionCategory.ADMIN_ADJUSTMENT,
+            description,
+            created_by=current_user.id
+        )
+    except CreditAccountNotFoundError:
         raise HTTPException(status_code=404, detail='User not found')
-    
-    current_free = user.get('credits_free', 0)
-    current_paid = user.get('credits_paid', 0)
-    total = current_free + current_paid
-    
-    if total < amount:
+    except InsufficientCreditsError:
         raise HTTPException(status_code=400, detail='Insufficient credits')
     
-    # Deduct from paid first, then free
-    remaining_to_deduct = amount
-    new_paid = current_paid
-    new_free = current_free
-    
-    if current_paid >= remaining_to_deduct:
-        new_paid = current_paid - remaining_to_deduct
-    else:
-        new_paid = 0
-        remaining_to_deduct -= current_paid
-        new_free = current_free - remaining_to_deduct
-    
-    await db.users.update_one(
-        {'id': user_id},
-        {'$set': {'credits_free': new_free, 'credits_paid': new_paid}}
-    )
-    
-    # Create transaction record
-    transaction = CreditTransactionExtended(
-        user_id=user_id,
-        amount=-amount,
-        transaction_type=TransactionType.ADMIN_DEDUCT,
-        category=TransactionCategory.ADMIN_ADJUSTMENT,
-        description=description,
-        balance_free=new_free,
-        balance_paid=new_paid,
-        created_by=current_user.id
-    )
-    
-    await db.credit_transactions.insert_one(transaction.model_dump())
-    
     return {
         'message': 'Credits deducted successfully',
         'user_id': user_id,
         'amount_deducted': amount,
-        'new_balance': {
-            'free': new_free,
-            'paid': new_paid,
-            'total': new_free + new_paid
-        }
+        'new_balance': balance
     }
 
 
 # ==================== Transaction History ====================
 
-@router.get('/transactions')
-async def get_transaction_history(
+def build_transaction_query(
+    user_id: Optional[str] = None,
     transaction_type: Optional[str] = None,
     category: Optional[str] = None,
     start_date: Optional[str] = None,
-    end_date: Optional[str] = None,
-    page: int = 1,
-    limit: int = 50,
-    current_user: User = Depends(get_current_user)
-):
-    """Get credit transaction history"""
-    if not current_user:
-        raise HTTPException(status_code=401, detail='Authentication required')
+    end_date: Optional[str] = None
+) -> dict:
+    """Build the credit_transactions filter for history/export parameters"""
+    query = {}
     
-    # Build query
-    query = {'user_id': current_user.id}
+    if user_id:
+        query['user_id'] = user_id
     
     if transaction_type:
         query['transaction_type'] = transaction_type
@@ -270,6 +218,59 @@ async def get_transaction_history(
             date_query['$lte'] = datetime.fromisoformat(end_date)
         query['created_at'] = date_query
     
+    return query
+
+
+# CSV export columns
+TRANSACTION_CSV_HEADER = [
+    'Date',
+    'Transaction Type',
+    'Category',
+    'Amount',
+    'Description',
+    'Free Balance',
+    'Paid Balance',
+    'Total Balance',
+    'Reference ID'
+]
+
+def transaction_csv_row(t) -> list:
+    """CSV row of a (possibly legacy) transaction document"""
+    converted_t = convert_legacy_transaction(t)
+    return [
+        converted_t.created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        converted_t.transaction_type,
+        converted_t.category,
+        converted_t.amount,
+        converted_t.description,
+        converted_t.balance_free,
+        converted_t.balance_paid,
+        converted_t.balance_free + converted_t.balance_paid,
+        converted_t.reference_id or ''
+    ]
+
+def admin_transaction_csv_row(t) -> list:
+    """CSV row of a transaction for the admin export (with user and admin IDs)"""
+    return [t.get('user_id', '')] + transaction_csv_row(t) + [t.get('created_by') or '']
+
+
+@router.get('/transactions')
+async def get_transaction_history(
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    page: int = 1,
+    limit: int = 50,
+    current_user: User = Depends(get_current_user)
+):
+    """Get credit transaction history"""
+    if not current_user:
+        raise HTTPException(status_code=401, detail='Authentication required')
+    
+    # Build query
+    query = build_transaction_query(current_user.id, transaction_type, category, start_date, end_date)
+    
     # Get total count
     total = await db.credit_transactions.count_documents(query)
     
@@ -300,63 +301,13 @@ async def export_transactions_csv(
         raise HTTPException(status_code=401, detail='Authentication required')
     
     # Build query
-    query = {'user_id': current_user.id}
-    
-    if transaction_type:
-        query['transaction_type'] = transaction_type
-    
-    if category:
-        query['category'] = category
+    query = build_transaction_query(current_user.id, transaction_type, category, start_date, end_date)
     
-    if start_date or end_date:
-        date_query = {}
-        if start_date:
-            date_query['$gte'] = datetime.fromisoformat(start_date)
-        if end_date:
-            date_query['$lte'] = datetime.fromisoformat(end_date)
-        query['created_at'] = date_query
-    
-    # Get all transactions
+    # Stream rows from the cursor in batches
     transactions_cursor = db.credit_transactions.find(query).sort('created_at', -1)
-    transactions = await transactions_cursor.to_list(length=None)
-    
-    # Create CSV
-    output = io.StringIO()
-    writer = csv.writer(output)
-    
-    # Write header
-    writer.writerow([
-        'Date',
-        'Transaction Type',
-        'Category',
-        'Amount',
-        'Description',
-        'Free Balance',
-        'Paid Balance',
-        'Total Balance',
-        'Reference ID'
-    ])
-    
-    # Write data
-    for t in transactions:
-        converted_t = convert_legacy_transaction(t)
-        writer.writerow([
-            converted_t.created_at.strftime('%Y-%m-%d %H:%M:%S'),
-            converted_t.transaction_type,
-            converted_t.category,
-            converted_t.amount,
-            converted_t.description,
-            converted_t.balance_free,
-            converted_t.balance_paid,
-            converted_t.balance_free + converted_t.balance_paid,
-            converted_t.reference_id or ''
-        ])
-    
-    # Prepare response
-    output.seek(0)
     
     return StreamingResponse(
-        iter([output.getvalue()]),
+        stream_csv(transactions_cursor, TRANSACTION_CSV_HEADER, transaction_csv_row),
         media_type='text/csv',
         headers={
             'Content-Disposition': f'attachment; filename=transactions_{datetime.utcnow().strftime("%Y%m%d")}.csv'
@@ -380,24 +331,7 @@ async def admin_get_all_transactions(
         raise HTTPException(status_code=403, detail='Admin access required')
     
     # Build query
-    query = {}
-    
-    if user_id:
-        query['user_id'] = user_id
-    
-    if transaction_type:
-        query['transaction_type'] = transaction_type
-    
-    if category:
-        query['category'] = category
-    
-    if start_date or end_date:
-        date_query = {}
-        if start_date:
-            date_query['$gte'] = datetime.fromisoformat(start_date)
-        if end_date:
-            date_query['$lte'] = datetime.fromisoformat(end_date)
-        query['created_at'] = date_query
+    query = build_transaction_query(user_id, transaction_type, category, start_date, end_date)
     
     # Get total count
     total = await db.credit_transactions.count_documents(query)
@@ -414,3 +348,31 @@ async def admin_get_all_transactions(
         'limit': limit,
         'pages': (total + limit - 1) // limit
     }
+
+
+@router.get('/admin/transactions/export')
+async def admin_export_transactions_csv(
+    user_id: Optional[str] = None,
+    transaction_type: Optional[str] = None,
+    category: Optional[str] = None,
+    start_date: Optional[str] = None,
+    end_date: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Admin: Export all credit transactions as CSV"""
+    if not current_user or current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail='Admin access required')
+    
+    # Build query
+    query = build_transaction_query(user_id, transaction_type, category, start_date, end_date)
+    
+    # Stream rows from the cursor in batches
+    transactions_cursor = db.credit_transactions.find(query).sort('created_at', -1)
+    
+    return StreamingResponse(
+        stream_csv(transactions_cursor, ['User ID'] + TRANSACTION_CSV_HEADER + ['Created By'], admin_transaction_csv_row),
+        media_type='text/csv',
+        headers={
+            'Content-Disposition': f'attachment; filename=all_transactions_{datetime.utcnow().strftime("%Y%m%d")}.csv'
+        }
+    )
@@ -12,11 +12,12 @@ from models_credit_interview import (
     InterviewRatingCreate,
     SkillRating,
     PlatformSettings,
-    CreditTransactionExtended,
     TransactionType,
     TransactionCategory
 )
 from routes.auth import get_current_user
+from utils.skill_dictionary import skill_dictionary
+from utils.credit_ledger import add_credits, deduct_credits, CreditAccountNotFoundError, InsufficientCreditsError
 
 router = APIRouter()
 
@@ -41,43 +42,13 @@ async def create_interview_request(
     
     cost = settings.get('interview_request_cost', 5000)
     
-    # Check job seeker has enough credits
-    user = await db.users.find_one({'id': current_user.id})
-    total_credits = user.get('credits_free', 0) + user.get('credits_paid', 0)
-    
-    if total_credits < cost:
-        raise HTTPException(
-            status_code=400,
-            detail=f'Insufficient credits. Required: {cost}, Available: {total_credits}'
-        )
-    
     # Get job seeker profile for name
     profile = await db.jobseeker_profiles.find_one({'user_id': current_user.id})
     jobseeker_name = None
     if profile:
         jobseeker_name = f"{profile.get('first_name', '')} {profile.get('last_name', '')}".strip()
     
-    # Deduct credits
-    credits_paid = user.get('credits_paid', 0)
-    credits_free = user.get('credits_free', 0)
-    
-    remaining_to_deduct = cost
-    new_paid = credits_paid
-    new_free = credits_free
-    
-    if credits_paid >= remaining_to_deduct:
-        new_paid = credits_paid - remaining_to_deduct
-    else:
-        new_paid = 0
-        remaining_to_deduct -= credits_paid
-        new_free = credits_free - remaining_to_deduct
-    
-    await db.users.update_one(
-        {'id': current_user.id},
-        {'$set': {'credits_paid': new_paid, 'credits_free': new_free}}
-    )
-    
-    # Create interview request
+    # Interview request (inserted once the credits are paid)
     import uuid
     interview_request = InterviewRequest(
         id=str(uuid.uuid4()),
@@ -89,22 +60,24 @@ async def create_interview_request(
         jobseeker_notes=request_data.jobseeker_notes
     )
     
-    await db.interview_requests.insert_one(interview_request.model_dump())
-    
-    # Create transaction record
-    transaction = CreditTransactionExtended(
-        user_id=current_user.id,
-        amount=-cost,
-        transaction_type=TransactionType.SPEND,
-        category=TransactionCategory.INTERVIEW_REQUEST,
-        description='Interview verification request',
-        reference_id=interview_request.id,
-        reference_type='interview_request',
-        balance_free=new_free,
-        balance_paid=new_paid
-    )
+    # Deduct credits
+    try:
+        balance = await deduct_credits(
+            db,
+            current_user.id,
+            cost,
+            TransactionType.SPEND,
+            TransactionCategory.INTERVIEW_REQUEST,
+            'Interview verification request',
+            reference_id=interview_request.id,
+            reference_type='interview_request'
+        )
+    except CreditAccountNotFoundError:
+        raise HTTPException(status_code=404, detail='User not found')
+    except InsufficientCreditsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    await db.credit_transactions.insert_one(transaction.model_dump())
+    await db.interview_requests.insert_one(interview_request.model_dump())
     
     # Find matching interviewers
     matching_interviewers = await find_matching_interviewers(request_data.skills_to_verify)
@@ -121,16 +94,16 @@ async def create_interview_request(
         'message': 'Interview request created successfully',
         'request': interview_request,
         'matching_interviewers_count': len(matching_interviewers),
-        'remaining_credits': {
-            'free': new_free,
-            'paid': new_paid,
-            'total': new_free + new_paid
-        }
+        'remaining_credits': balance
     }
 
 
 async def find_matching_interviewers(skills: List[str]) -> List[str]:
     """Find interviewers whose primary skills match the required skills"""
+    # Compare canonical names so aliases ("js" / "JavaScript") match, without
+    # interning arbitrary request skills into the dictionary
+    required_skills = {skill_dictionary.canonical(skill) for skill in skills}
+    
     # Get all interviewer profiles
     interviewer_profiles = await db.interviewer_profiles.find({}).to_list(100)
     
@@ -143,7 +116,7 @@ async def find_matching_interviewers(skills: List[str]) -> List[str]:
                 if isinstance(skill_obj, dict):
                     skill_name = skill_obj.get('skill')
                     is_primary = skill_obj.get('is_primary', False)
-                    if is_primary and skill_name in skills:
+                    if is_primary and skill_name and skill_dictionary.canonical(skill_name) in required_skills:
                         matching_ids.append(profile['user_id'])
                         break
     
@@ -331,38 +304,25 @@ async def submit_interview_rating(
     )
     
     # Add credits to interviewer
-    interviewer = await db.users.find_one({'id': current_user.id})
-    new_free_balance = interviewer.get('credits_free', 0) + earnings
-    
-    await db.users.update_one(
-        {'id': current_user.id},
-        {'$set': {'credits_free': new_free_balance}}
-    )
-    
-    # Create transaction record
-    transaction = CreditTransactionExtended(
-        user_id=current_user.id,
-        amount=earnings,
-        transaction_type=TransactionType.EARN,
-        category=TransactionCategory.INTERVIEW_COMPLETION,
-        description=f'Interview completed for {request["jobseeker_email"]}',
-        reference_id=rating.id,
-        reference_type='interview_rating',
-        balance_free=new_free_balance,
-        balance_paid=interviewer.get('credits_paid', 0)
-    )
-    
-    await db.credit_transactions.insert_one(transaction.model_dump())
+    try:
+        balance = await add_credits(
+            db,
+            current_user.id,
+            earnings,
+            TransactionType.EARN,
+            TransactionCategory.INTERVIEW_COMPLETION,
+            f'Interview completed for {request["jobseeker_email"]}',
+            reference_id=rating.id,
+            reference_type='interview_rating'
+        )
+    except CreditAccountNotFoundError:
+        raise HTTPException(status_code=404, detail='User not found')
     
     return {
         'message': 'Rating submitted successfully',
         'rating': rating,
         'credits_earned': earnings,
-        'new_balance': {
-            'free': new_free_balance,
-            'paid': interviewer.get('credits_paid', 0),
-            'total': new_free_balance + interviewer.get('credits_paid', 0)
-        }
+        'new_balance': balance
     }
 
 
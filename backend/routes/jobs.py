@@ -1,10 +1,42 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime, timedelta
+import asyncio
+from pymongo.errors import DuplicateKeyError
 
 from models import User, UserRole
-from models_job import Job, JobCreate, JobUpdate, JobApplication, JobApplicationCreate, JobApplicationUpdate
+from models_job import Job, JobCreate, JobUpdate, JobApplication, JobApplicationCreate, JobApplicationUpdate, JobApplicationBulkUpdate
 from routes.auth import get_current_user
+from utils.ats_features import load_ats_candidates, has_current_features
+from utils.ats_index import job_index
+from utils.ats_cache import ats_score_cache
+from utils.skill_dictionary import skill_dictionary
+from utils.job_search import (
+    build_text_search,
+    build_summary_facets,
+    parse_summary_facets,
+    job_facet_cache,
+    job_search_cache
+)
+from utils.counters import job_counters
+from utils.pagination import keyset_sort, keyset_filter, next_cursor
+from utils.dataloader import RequestLoaders
+from utils.application_summaries import (
+    application_summaries,
+    job_summary,
+    applicant_summary,
+    JOB_SUMMARY_FIELDS,
+    APPLICANT_SUMMARY_PROJECTION
+)
+from utils.job_rankings import (
+    update_job_rankings,
+    delete_job_rankings,
+    score_candidate,
+    add_ranking_entry,
+    job_ranking_refresher,
+    JOB_REQUIREMENT_FIELDS
+)
+from utils.indexes import index_exists, JOB_APPLICATION_UNIQUE_KEYS
 
 router = APIRouter()
 
@@ -33,13 +65,60 @@ async def create_job(
         id=str(uuid.uuid4()),
         employer_id=current_user.id,
         company_name=employer_profile['company_name'],
+        required_skill_ids=await skill_dictionary.intern(db, job_data.required_skills),
         **job_data.model_dump()
     )
     
     await db.jobs.insert_one(job.model_dump())
+    job_index.refresh(job.model_dump())
+    job_search_cache.invalidate()
     
     return {'message': 'Job posted successfully', 'job': job}
 
+@router.get('/jobs/recommended')
+async def get_recommended_jobs(
+    limit: int = 20,
+    current_user: User = Depends(get_current_user)
+):
+    """Get active jobs that best match the current job seeker's profile (reverse ATS matching)"""
+    if not current_user or current_user.role != UserRole.JOB_SEEKER:
+        raise HTTPException(status_code=403, detail='Only job seekers can get job recommendations')
+    
+    limit = max(1, min(limit, 100))
+    
+    await job_index.ensure_built(db)
+    
+    recommendations = job_index.get_cached(current_user.id)
+    cached = recommendations is not None and len(recommendations) >= min(limit, len(job_index))
+    if not cached:
+        profiles = await load_ats_candidates(db, {'user_id': current_user.id})
+        if not profiles:
+            raise HTTPException(status_code=404, detail='Profile not found')
+        recommendations = job_index.recommend(current_user.id, profiles[0]['ats_features'], limit)
+    recommendations = recommendations[:limit]
+    
+    # Fetch the recommended jobs in one query
+    job_ids = [job_id for job_id, _ in recommendations]
+    jobs = await db.jobs.find({'id': {'$in': job_ids}, 'status': 'active'}).to_list(None)
+    jobs_by_id = {job['id']: job for job in jobs}
+    
+    results = []
+    for job_id, ranking_result in recommendations:
+        job = jobs_by_id.get(job_id)
+        if not job:
+            continue
+        job['freshness_days'] = (datetime.utcnow() - job['created_at']).days
+        results.append({
+            'job': Job(**job),
+            **ranking_result
+        })
+    
+    return {
+        'jobs': results,
+        'total': len(results),
+        'cached': cached
+    }
+
 @router.get('/jobs/{job_id}')
 async def get_job(job_id: str):
     """Get job details by ID"""
@@ -48,11 +127,12 @@ async def get_job(job_id: str):
     if not job_data:
         raise HTTPException(status_code=404, detail='Job not found')
     
-    # Increment view count
-    await db.jobs.update_one(
-        {'id': job_id},
-        {'$inc': {'views_count': 1}}
-    )
+    # Increment view count (buffered, flushed in bulk)
+    job_counters.increment(job_id, 'views_count')
+    
+    # Include increments not flushed yet
+    for field, amount in job_counters.pending_for(job_id).items():
+        job_data[field] = job_data.get(field, 0) + amount
     
     # Calculate freshness
     created_at = job_data['created_at']
@@ -74,20 +154,74 @@ async def search_jobs(
     company: Optional[str] = None,
     freshness: Optional[int] = None,  # days
     sort_by: str = "created_at",  # created_at, salary, relevance
+    search_mode: str = "text",  # text (indexed, stemmed), regex
     page: int = 1,
-    limit: int = 20
+    limit: int = 20,
+    cursor: Optional[str] = None,  # next_cursor of the previous page (replaces page)
+    include_total: bool = True,
+    include_facets: bool = True
 ):
     """Search and filter jobs"""
     
+    # Normalize parameters so equivalent searches share a cache entry
+    query = query.strip() if query else None
+    if query and search_mode != 'regex':
+        query = query.lower()
+    location = location.strip().lower() if location else None
+    company = company.strip().lower() if company else None
+    if skills:
+        skills = ','.join(sorted({s.strip() for s in skills.split(',') if s.strip()})) or None
+    
+    search_params = {
+        'query': query,
+        'location': location,
+        'job_type': job_type,
+        'work_mode': work_mode,
+        'min_experience': min_experience,
+        'max_experience': max_experience,
+        'min_salary': min_salary,
+        'skills': skills,
+        'company': company,
+        'freshness': freshness,
+        'sort_by': sort_by,
+        'search_mode': search_mode,
+        'page': page,
+        'limit': limit,
+        'cursor': cursor,
+        'include_total': include_total,
+        'include_facets': include_facets
+    }
+    
+    # Popular searches are served from the cache; identical concurrent misses run one query
+    response, _ = await job_search_cache.get_or_compute(
+        tuple(search_params.items()),
+        lambda: run_job_search(**search_params)
+    )
+    return response
+
+async def build_job_search_filter(
+    query: Optional[str] = None,
+    location: Optional[str] = None,
+    job_type: Optional[str] = None,
+    work_mode: Optional[str] = None,
+    min_experience: Optional[float] = None,
+    max_experience: Optional[float] = None,
+    min_salary: Optional[int] = None,
+    skills: Optional[str] = None,
+    company: Optional[str] = None,
+    freshness: Optional[int] = None,
+    search_mode: str = "text"
+) -> Tuple[dict, bool]:
+    """Build the jobs filter for search parameters; also returns whether results have a text score"""
+    
     # Build query
     filter_query = {'status': 'active'}
     
-    # Text search on title and description
+    # Text search on title, skills and description ("quoted phrases" use a regex)
+    text_scored = False
     if query:
-        filter_query['$or'] = [
-            {'job_title': {'$regex': query, '$options': 'i'}},
-            {'description': {'$regex': query, '$options': 'i'}},
-        ]
+        text_filter, text_scored = build_text_search(query, search_mode)
+        filter_query.update(text_filter)
     
     # Location filter
     if location:
@@ -111,10 +245,14 @@ async def search_jobs(
     if min_salary:
         filter_query['min_salary'] = {'$gte': min_salary}
     
-    # Skills filter
+    # Skills filter (by skill ID, so aliases match; raw names for jobs posted before IDs)
     if skills:
         skill_list = [s.strip() for s in skills.split(',')]
-        filter_query['required_skills'] = {'$in': skill_list}
+        skill_ids = await skill_dictionary.intern(db, skill_list, allocate=False)
+        filter_query['$and'] = [{'$or': [
+            {'required_skill_ids': {'$in': skill_ids}},
+            {'required_skills': {'$in': skill_list}}
+        ]}]
     
     # Company filter
     if company:
@@ -125,19 +263,116 @@ async def search_jobs(
         cutoff_date = datetime.utcnow() - timedelta(days=freshness)
         filter_query['created_at'] = {'$gte': cutoff_date}
     
-    # Get total count
-    total = await db.jobs.count_documents(filter_query)
+    return filter_query, text_scored
+
+def build_job_search_pipeline(
+    filter_query: dict,
+    text_scored: bool,
+    sort_by: str,
+    page: int,
+    limit: int,
+    cursor: Optional[str],
+    compute_summary: bool
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Build the job search aggregation for a filter from build_job_search_filter()
+    
+    Returns:
+        Tuple of (pipeline, keyset sort field; None for relevance sort). With
+        compute_summary the page is a `results` facet next to the total and
+        facet counts, otherwise the pipeline returns the page (plus one) directly.
+    """
+    # Sort (relevance needs a text query, otherwise newest first)
+    sort_field = None
+    if sort_by == 'relevance' and text_scored:
+        sort_spec = [('score', -1), ('created_at', -1), ('id', -1)]
+    else:
+        sort_field = sort_by if sort_by in ['created_at', 'min_salary'] else 'created_at'
+        sort_order = -1  # descending
+        sort_spec = keyset_sort(sort_field, sort_order)
+    
+    # Pagination: continue after the cursor, or skip to the page
+    skip = 0
+    cursor_filter = None
+    if cursor:
+        if sort_field is None:
+            raise HTTPException(status_code=400, detail='Cursor pagination is not supported with relevance sort')
+        try:
+            cursor_filter = keyset_filter(sort_field, sort_order, cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail='Invalid cursor')
+    else:
+        skip = (page - 1) * limit
+    
+    # One aggregation: page of results (one extra job tells whether there is a
+    # next page), plus total and facet counts over the whole filter when needed.
+    # The cursor only narrows the filter itself when no summary is computed
+    if cursor_filter and not compute_summary:
+        filter_query.setdefault('$and', []).append(cursor_filter)
+        cursor_filter = None
+    
+    pipeline = [{'$match': filter_query}]
+    if sort_field is None:
+        pipeline.append({'$addFields': {'score': {'$meta': 'textScore'}}})
+    pipeline.append({'$sort': dict(sort_spec)})
+    
+    page_stages = [{'$skip': skip}, {'$limit': limit + 1}]
+    if cursor_filter:
+        page_stages.insert(0, {'$match': cursor_filter})
+    
+    if compute_summary:
+        return pipeline + [{'$facet': {'results': page_stages, **build_summary_facets()}}], sort_field
+    return pipeline + page_stages, sort_field
+
+async def run_job_search(
+    query: Optional[str],
+    location: Optional[str],
+    job_type: Optional[str],
+    work_mode: Optional[str],
+    min_experience: Optional[float],
+    max_experience: Optional[float],
+    min_salary: Optional[int],
+    skills: Optional[str],
+    company: Optional[str],
+    freshness: Optional[int],
+    sort_by: str,
+    search_mode: str,
+    page: int,
+    limit: int,
+    cursor: Optional[str],
+    include_total: bool,
+    include_facets: bool
+) -> dict:
+    """Run a job search against the database (search_jobs without the result cache)"""
+    filter_query, text_scored = await build_job_search_filter(
+        query, location, job_type, work_mode, min_experience, max_experience,
+        min_salary, skills, company, freshness, search_mode
+    )
     
-    # Sort
-    sort_field = sort_by if sort_by in ['created_at', 'min_salary'] else 'created_at'
-    sort_order = -1  # descending
+    # Total and facet counts: reused for a short TTL per filter combination
+    summary_key = (query, search_mode, location, job_type, work_mode, min_experience, max_experience,
+                   min_salary, skills, company, freshness)
+    summary = job_facet_cache.get(summary_key) if include_total or include_facets else None
+    compute_summary = (include_total or include_facets) and summary is None
     
-    # Pagination
-    skip = (page - 1) * limit
+    pipeline, sort_field = build_job_search_pipeline(
+        filter_query, text_scored, sort_by, page, limit, cursor, compute_summary
+    )
     
-    # Execute query
-    jobs_cursor = db.jobs.find(filter_query).sort(sort_field, sort_order).skip(skip).limit(limit)
-    jobs = await jobs_cursor.to_list(length=limit)
+    if compute_summary:
+        outcome = (await db.jobs.aggregate(pipeline, allowDiskUse=True).to_list(1))[0]
+        jobs = outcome['results']
+        summary = parse_summary_facets(outcome)
+        job_facet_cache.set(summary_key, summary)
+    else:
+        jobs = await db.jobs.aggregate(pipeline).to_list(limit + 1)
+    
+    total = summary['total'] if include_total else None
+    if sort_field is not None:
+        cursor_token = next_cursor(jobs, limit, sort_field)
+    else:
+        cursor_token = None
+        del jobs[limit:]
     
     # Calculate freshness for each job
     for job in jobs:
@@ -148,9 +383,11 @@ async def search_jobs(
     return {
         'jobs': [Job(**job) for job in jobs],
         'total': total,
-        'page': page,
+        'page': None if cursor else page,
         'limit': limit,
-        'pages': (total + limit - 1) // limit
+        'pages': (total + limit - 1) // limit if total is not None else None,
+        'next_cursor': cursor_token,
+        'facets': summary['facets'] if include_facets else None
     }
 
 @router.put('/jobs/{job_id}')
@@ -171,11 +408,23 @@ async def update_job(
     # Update job
     update_data = {k: v for k, v in job_data.model_dump().items() if v is not None}
     update_data['updated_at'] = datetime.utcnow()
+    if 'required_skills' in update_data:
+        update_data['required_skill_ids'] = await skill_dictionary.intern(db, update_data['required_skills'])
     
     await db.jobs.update_one(
         {'id': job_id},
-        {'$set': update_data}
+        {'$set': update_data, '$inc': {'revision': 1}}
     )
+    job_index.refresh({**existing_job, **update_data})
+    job_search_cache.invalidate()
+    
+    # Requirement changes rescore every applicant in the job's ranking (in the background)
+    if any(field in update_data for field in JOB_REQUIREMENT_FIELDS):
+        job_ranking_refresher.job_changed(job_id)
+    
+    # Refresh the job summary copied onto its applications (in the background)
+    if any(field in update_data for field in JOB_SUMMARY_FIELDS.values()):
+        application_summaries.job_changed({**existing_job, **update_data})
     
     return {'message': 'Job updated successfully'}
 
@@ -195,6 +444,10 @@ async def delete_job(
     
     # Delete job
     await db.jobs.delete_one({'id': job_id})
+    job_index.discard(job_id)
+    job_search_cache.invalidate()
+    await delete_job_rankings(db, job_id)
+    await ats_score_cache.discard_job(db, job_id)
     
     return {'message': 'Job deleted successfully'}
 
@@ -218,6 +471,10 @@ async def get_my_jobs(
 
 # ==================== Job Applications ====================
 
+# Applicant fields read when applying: the summary copied onto the application
+# and the ATS features the applicant is ranked by
+APPLY_PROFILE_PROJECTION = {**APPLICANT_SUMMARY_PROJECTION, 'ats_features': 1}
+
 @router.post('/applications')
 async def apply_for_job(
     application_data: JobApplicationCreate,
@@ -227,36 +484,60 @@ async def apply_for_job(
     if not current_user or current_user.role != UserRole.JOB_SEEKER:
         raise HTTPException(status_code=403, detail='Only job seekers can apply for jobs')
     
-    # Check if job exists
-    job = await db.jobs.find_one({'id': application_data.job_id, 'status': 'active'})
+    # Job, applicant summary and ATS features in one round trip
+    job, profile = await asyncio.gather(
+        db.jobs.find_one({'id': application_data.job_id, 'status': 'active'}),
+        db.jobseeker_profiles.find_one({'user_id': current_user.id}, APPLY_PROFILE_PROJECTION)
+    )
     if not job:
         raise HTTPException(status_code=404, detail='Job not found or no longer active')
     
-    # Check if already applied
-    existing_application = await db.job_applications.find_one({
-        'job_id': application_data.job_id,
-        'job_seeker_id': current_user.id
-    })
-    if existing_application:
-        raise HTTPException(status_code=400, detail='You have already applied for this job')
-    
-    # Create application
+    # Until the unique (job_id, job_seeker_id) index exists (not created yet,
+    # or blocked by old duplicates) duplicates have to be looked up first
+    if not await index_exists(db, 'job_applications', JOB_APPLICATION_UNIQUE_KEYS, unique=True):
+        existing_application = await db.job_applications.find_one({
+            'job_id': application_data.job_id,
+            'job_seeker_id': current_user.id
+        }, {'_id': 1})
+        if existing_application:
+            raise HTTPException(status_code=400, detail='You have already applied for this job')
+    
+    # Score the applicant from their stored features, without reloading them
+    ranking = None
+    if profile and has_current_features(profile):
+        await skill_dictionary.intern(db, job.get('required_skills') or [], allocate=False)
+        ranking = score_candidate(job, profile['ats_features'])
+    
+    # Create application (with job and applicant summaries for listings)
     import uuid
     application = JobApplication(
         id=str(uuid.uuid4()),
         job_id=application_data.job_id,
         job_seeker_id=current_user.id,
         employer_id=job['employer_id'],
-        cover_letter=application_data.cover_letter
+        cover_letter=application_data.cover_letter,
+        ats_score=ranking['overall_score'] if ranking else None,
+        **job_summary(job),
+        **applicant_summary(profile)
     )
     
-    await db.job_applications.insert_one(application.model_dump())
+    # The unique index rejects a second application, including one racing
+    # this request. The ranking entry is written alongside (rewriting an
+    # existing applicant's entry is harmless).
+    writes = [db.job_applications.insert_one(application.model_dump())]
+    if ranking:
+        writes.append(add_ranking_entry(db, job['id'], current_user.id, ranking))
+    try:
+        await asyncio.gather(*writes)
+    except DuplicateKeyError:
+        raise HTTPException(status_code=400, detail='You have already applied for this job')
     
-    # Increment applications count
-    await db.jobs.update_one(
-        {'id': application_data.job_id},
-        {'$inc': {'applications_count': 1}}
-    )
+    # Increment applications count (buffered, flushed in bulk)
+    job_counters.increment(application_data.job_id, 'applications_count')
+    
+    # Profiles without current features are scored the slow way (which backfills them)
+    if profile and not ranking:
+        await update_job_rankings(db, job, [current_user.id])
     
     return {'message': 'Application submitted successfully', 'application': application}
 
@@ -270,13 +551,16 @@ async def get_my_applications(
     
     applications = await db.job_applications.find({'job_seeker_id': current_user.id}).sort('applied_at', -1).to_list(100)
     
-    # Enrich with job details
-    for app in applications:
-        job = await db.jobs.find_one({'id': app['job_id']})
-        if job:
-            app['job_title'] = job['job_title']
-            app['company_name'] = job['company_name']
-            app['location'] = job['location']
+    # Job details are stored on the application; only applications from
+    # before summaries are joined (one batched query) and queued for repair
+    legacy = [app for app in applications if 'job_title' not in app]
+    if legacy:
+        loaders = RequestLoaders(db)
+        jobs = await loaders.jobs.load_many(app['job_id'] for app in legacy)
+        for app, job in zip(legacy, jobs):
+            if job:
+                app.update(job_summary(job))
+                application_summaries.job_changed(job)
     
     return [JobApplication(**app) for app in applications]
 
@@ -296,17 +580,132 @@ async def get_job_applications(
     
     applications = await db.job_applications.find({'job_id': job_id}).sort('applied_at', -1).to_list(100)
     
-    # Enrich with job seeker details
-    for app in applications:
-        profile = await db.jobseeker_profiles.find_one({'user_id': app['job_seeker_id']})
-        if profile:
-            app['applicant_name'] = profile.get('full_name', 'N/A')
-            app['applicant_headline'] = profile.get('headline', '')
-            app['applicant_location'] = profile.get('location', '')
-            app['applicant_experience'] = profile.get('total_experience_years', 0)
+    # Applicant details are stored on the application; only applications from
+    # before summaries are joined (one batched query) and queued for repair
+    legacy = [app for app in applications if 'applicant_name' not in app]
+    if legacy:
+        loaders = RequestLoaders(db)
+        profiles = await loaders.jobseeker_profiles.load_many(app['job_seeker_id'] for app in legacy)
+        for app, profile in zip(legacy, profiles):
+            if profile:
+                app.update(applicant_summary(profile))
+                application_summaries.profile_changed(profile)
     
     return [JobApplication(**app) for app in applications]
 
+# Applicant card fields joined into the inbox
+APPLICANT_CARD_FIELDS = [
+    'full_name', 'headline', 'location', 'total_experience_years',
+    'profile_image_url', 'overall_rating', 'verification_count'
+]
+
+@router.get('/applications/job/{job_id}/inbox')
+async def get_applicant_inbox(
+    job_id: str,
+    status: Optional[str] = None,
+    sort_by: str = 'applied_at',
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user)
+):
+    """Page through a job's applications with applicant cards (Employers only, own jobs)"""
+    if not current_user or current_user.role != UserRole.EMPLOYER:
+        raise HTTPException(status_code=403, detail='Only employers can view job applications')
+    
+    if sort_by not in ['applied_at', 'ats_score']:
+        raise HTTPException(status_code=400, detail='sort_by must be applied_at or ats_score')
+    
+    # Check if job belongs to employer
+    job = await db.jobs.find_one({'id': job_id, 'employer_id': current_user.id}, {'_id': 0, 'id': 1})
+    if not job:
+        raise HTTPException(status_code=404, detail='Job not found or unauthorized')
+    
+    match = {'job_id': job_id}
+    if status:
+        match['status'] = status
+    if cursor:
+        try:
+            match = {'$and': [match, keyset_filter(sort_by, -1, cursor)]}
+        except ValueError:
+            raise HTTPException(status_code=400, detail='Invalid cursor')
+    
+    # One aggregation: page of applications (plus one to detect a next page)
+    # joined with a compact card of each applicant's profile
+    pipeline = [
+        {'$match': match},
+        {'$sort': dict(keyset_sort(sort_by, -1))},
+        {'$limit': limit + 1},
+        {'$lookup': {
+            'from': 'jobseeker_profiles',
+            'localField': 'job_seeker_id',
+            'foreignField': 'user_id',
+            'pipeline': [{'$project': {'_id': 0, **{field: 1 for field in APPLICANT_CARD_FIELDS}}}],
+            'as': 'applicant'
+        }},
+        {'$set': {'applicant': {'$first': '$applicant'}}},
+        {'$project': {'_id': 0}}
+    ]
+    applications = await db.job_applications.aggregate(pipeline).to_list(limit + 1)
+    
+    return {
+        'applications': applications,
+        'limit': limit,
+        'next_cursor': next_cursor(applications, limit, sort_by)
+    }
+
+# Applications per bulk status update
+BULK_UPDATE_MAX_APPLICATIONS = 1000
+
+@router.post('/applications/bulk-status')
+async def bulk_update_application_status(
+    update_data: JobApplicationBulkUpdate,
+    current_user: User = Depends(get_current_user)
+):
+    """Update the status and/or notes of many applications at once (Employers only, own applications)"""
+    if not current_user or current_user.role != UserRole.EMPLOYER:
+        raise HTTPException(status_code=403, detail='Only employers can update applications')
+    
+    update_dict = update_data.model_dump(exclude={'application_ids'}, exclude_none=True)
+    if not update_dict:
+        raise HTTPException(status_code=400, detail='Provide a status or notes to update')
+    
+    application_ids = list(dict.fromkeys(update_data.application_ids))
+    if not application_ids:
+        raise HTTPException(status_code=400, detail='No applications given')
+    if len(application_ids) > BULK_UPDATE_MAX_APPLICATIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f'At most {BULK_UPDATE_MAX_APPLICATIONS} applications can be updated at once'
+        )
+    
+    # Ownership check for all applications in one query
+    owned = await db.job_applications.find(
+        {'id': {'$in': application_ids}, 'employer_id': current_user.id},
+        {'_id': 0, 'id': 1}
+    ).to_list(None)
+    owned_ids = {app['id'] for app in owned}
+    
+    if owned_ids:
+        update_dict['updated_at'] = datetime.utcnow()
+        await db.job_applications.update_many(
+            {'id': {'$in': list(owned_ids)}, 'employer_id': current_user.id},
+            {'$set': update_dict}
+        )
+    
+    results = [
+        {
+            'application_id': application_id,
+            'result': 'updated' if application_id in owned_ids else 'not_found'
+        }
+        for application_id in application_ids
+    ]
+    
+    return {
+        'message': f'{len(owned_ids)} of {len(application_ids)} applications updated',
+        'updated': len(owned_ids),
+        'results': results
+    }
+
 @router.put('/applications/{application_id}')
 async def update_application_status(
     application_id: str,
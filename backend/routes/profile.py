@@ -13,6 +13,14 @@ from models_profile import (
 from routes.auth import get_current_user
 from utils.s3 import upload_file_to_s3, delete_file_from_s3, generate_presigned_url
 from utils.document_converter import convert_doc_to_pdf, validate_file_size, validate_file_type
+from utils.ats_features import compute_ats_features, load_ats_candidates, ATS_CANDIDATE_PROJECTION
+from utils.ats_index import candidate_index, job_index
+from utils.ats_cache import ats_score_cache
+from utils.skill_dictionary import skill_dictionary
+from utils.dataloader import RequestLoaders
+from utils.application_summaries import application_summaries, APPLICANT_SUMMARY_FIELDS
+from utils.job_rankings import refresh_candidate_rankings, build_ranking_query, JOB_RANKING_SORT
+from utils.pagination import next_cursor
 
 router = APIRouter()
 
@@ -49,8 +57,15 @@ async def create_jobseeker_profile(
         'resume_original_url': None,
         **profile_data
     }
+    profile_dict['ats_features'] = await compute_ats_features(db, profile_dict)
     
     await db.jobseeker_profiles.insert_one(profile_dict)
+    candidate_index.refresh(current_user.id, profile_dict['ats_features'])
+    job_index.invalidate_user(current_user.id)
+    await refresh_candidate_rankings(db, current_user.id, profile_dict['ats_features'])
+    
+    # Applications made before the profile existed carry an empty applicant summary
+    application_summaries.profile_changed(profile_dict)
     
     return {'message': 'Profile created successfully', 'profile': profile_dict}
 
@@ -81,14 +96,23 @@ async def update_jobseeker_profile(
         raise HTTPException(status_code=404, detail='Profile not found')
     
     # Update with all fields from profile_data
-    update_data = {k: v for k, v in profile_data.items() if v is not None and k != 'user_id' and k != 'id'}
+    update_data = {k: v for k, v in profile_data.items() if v is not None and k not in ('user_id', 'id', 'ats_features', 'revision')}
     update_data['updated_at'] = datetime.utcnow()
+    update_data['ats_features'] = await compute_ats_features(db, {**existing_profile, **update_data})
     
     await db.jobseeker_profiles.update_one(
         {'user_id': current_user.id},
-        {'$set': update_data}
+        {'$set': update_data, '$inc': {'revision': 1}}
     )
     
+    candidate_index.refresh(current_user.id, update_data['ats_features'])
+    job_index.invalidate_user(current_user.id)
+    await refresh_candidate_rankings(db, current_user.id, update_data['ats_features'])
+    
+    # Refresh the applicant summary copied onto their applications (in the background)
+    if any(field in update_data for field in APPLICANT_SUMMARY_FIELDS.values()):
+        application_summaries.profile_changed({**existing_profile, **update_data})
+    
     return {'message': 'Profile updated successfully'}
 
 @router.post('/jobseeker/profile/image')
@@ -395,24 +419,22 @@ async def create_company(company_data: CompanyCreate, current_user: User = Depen
 
 # ==================== Job Seeker Search (Employer Feature) ====================
 
-@router.get('/jobseeker/search')
-async def search_jobseekers(
+# Talent search sort orders
+JOBSEEKER_SEARCH_SORTS = {
+    'relevance': [('overall_rating', -1), ('verification_count', -1)],
+    'experience': [('experience_years', -1)],
+    'recent': [('updated_at', -1)]
+}
+
+def build_jobseeker_search_filter(
     query: Optional[str] = None,
     location: Optional[str] = None,
     experience_min: Optional[int] = None,
     experience_max: Optional[int] = None,
     skills: Optional[str] = None,
-    verified_only: Optional[bool] = False,
-    sort_by: str = 'relevance',
-    page: int = 1,
-    limit: int = 20,
-    current_user: User = Depends(get_current_user)
-):
-    """Search job seekers (employer only)"""
-    if not current_user or current_user.role != UserRole.EMPLOYER:
-        raise HTTPException(status_code=403, detail='Only employers can search talent')
-    
-    # Build search filters
+    verified_only: Optional[bool] = False
+) -> dict:
+    """Build the jobseeker_profiles filter for talent search parameters"""
     filters = {}
     
     if query:
@@ -441,24 +463,42 @@ async def search_jobseekers(
     if verified_only:
         filters['verification_status'] = 'verified'
     
+    return filters
+
+@router.get('/jobseeker/search')
+async def search_jobseekers(
+    query: Optional[str] = None,
+    location: Optional[str] = None,
+    experience_min: Optional[int] = None,
+    experience_max: Optional[int] = None,
+    skills: Optional[str] = None,
+    verified_only: Optional[bool] = False,
+    sort_by: str = 'relevance',
+    page: int = 1,
+    limit: int = 20,
+    current_user: User = Depends(get_current_user)
+):
+    """Search job seekers (employer only)"""
+    if not current_user or current_user.role != UserRole.EMPLOYER:
+        raise HTTPException(status_code=403, detail='Only employers can search talent')
+    
+    # Build search filters
+    filters = build_jobseeker_search_filter(query, location, experience_min, experience_max, skills, verified_only)
+    
     # Sorting
-    sort_options = {
-        'relevance': [('overall_rating', -1), ('verification_count', -1)],
-        'experience': [('experience_years', -1)],
-        'recent': [('updated_at', -1)]
-    }
-    sort = sort_options.get(sort_by, sort_options['relevance'])
+    sort = JOBSEEKER_SEARCH_SORTS.get(sort_by, JOBSEEKER_SEARCH_SORTS['relevance'])
     
     # Pagination
     skip = (page - 1) * limit
     
     # Execute query
-    profiles_cursor = db.jobseeker_profiles.find(filters, {'_id': 0}).sort(sort).skip(skip).limit(limit)
+    profiles_cursor = db.jobseeker_profiles.find(filters, {'_id': 0, 'ats_features': 0}).sort(sort).skip(skip).limit(limit)
     profiles = await profiles_cursor.to_list(limit)
     
-    # Get user emails for each profile
-    for profile in profiles:
-        user = await db.users.find_one({'id': profile['user_id']}, {'_id': 0, 'email': 1})
+    # Get user emails for each profile (one batched query)
+    loaders = RequestLoaders(db)
+    users = await loaders.users.load_many(profile['user_id'] for profile in profiles)
+    for profile, user in zip(profiles, users):
         if user:
             profile['email'] = user['email']
     
@@ -520,12 +560,17 @@ async def update_jobseeker_settings(
     
     update_data = {k: v for k, v in settings_data.items() if k in allowed_fields and v is not None}
     update_data['updated_at'] = datetime.utcnow()
+    update_data['ats_features'] = await compute_ats_features(db, {**existing_profile, **update_data})
     
     await db.jobseeker_profiles.update_one(
         {'user_id': current_user.id},
-        {'$set': update_data}
+        {'$set': update_data, '$inc': {'revision': 1}}
     )
     
+    candidate_index.refresh(current_user.id, update_data['ats_features'])
+    job_index.invalidate_user(current_user.id)
+    await refresh_candidate_rankings(db, current_user.id, update_data['ats_features'])
+    
     return {'message': 'Settings updated successfully'}
 
 # ==================== ATS Ranking ====================
@@ -579,8 +624,9 @@ async def rank_multiple_candidates(
     """
     Rank multiple candidates for a job (employer feature)
     Requires: job_id, candidate_ids (optional, if not provided ranks all applicants)
+    Optional: top_k (return only the best top_k candidates)
     """
-    from utils.ats_ranking import calculate_ats_ranking
+    from utils.ats_parallel import rank_candidates
     
     if current_user.role != UserRole.EMPLOYER:
         raise HTTPException(status_code=403, detail='Only employers can use this feature')
@@ -600,11 +646,14 @@ async def rank_multiple_candidates(
     
     # Get candidate IDs
     candidate_ids = data.get('candidate_ids', [])
+    top_k = data.get('top_k')
+    if top_k is not None and (not isinstance(top_k, int) or top_k < 1):
+        raise HTTPException(status_code=400, detail='top_k must be a positive integer')
     
     # If no specific candidates, get all applicants for this job
     if not candidate_ids:
-        applications = await db.applications.find({'job_id': job_id}, {'_id': 0, 'jobseeker_id': 1}).to_list(1000)
-        candidate_ids = [app['jobseeker_id'] for app in applications]
+        applications = await db.job_applications.find({'job_id': job_id}, {'_id': 0, 'job_seeker_id': 1}).to_list(None)
+        candidate_ids = [app['job_seeker_id'] for app in applications]
     
     if not candidate_ids:
         return {
@@ -614,26 +663,182 @@ async def rank_multiple_candidates(
             'message': 'No candidates to rank'
         }
     
-    # Rank all candidates
+    # Make sure the mirror knows the job's skills before it is prepared
+    await skill_dictionary.intern(db, job.get('required_skills') or [])
+    
+    # Fetch all candidate profiles in one query (precomputed features only)
+    profiles = await load_ats_candidates(db, {'user_id': {'$in': candidate_ids}})
+    profiles_by_user = {profile['user_id']: profile for profile in profiles}
+    candidates = [profiles_by_user[candidate_id] for candidate_id in candidate_ids if candidate_id in profiles_by_user]
+    
+    # Reuse cached scores for unchanged (job, profile) revision pairs
+    cached_results, cache_stats = await ats_score_cache.lookup(db, job, candidates)
+    
+    # Rank the remaining candidates (large sets run in the process pool)
+    uncached = [candidate for candidate in candidates if candidate['user_id'] not in cached_results]
+    fresh_results = await rank_candidates(job, uncached, top_k=top_k)
+    scored = [(candidate, result) for candidate, result in zip(uncached, fresh_results) if result is not None]
+    await ats_score_cache.store(db, job, [candidate for candidate, _ in scored], [result for _, result in scored])
+    
+    results_by_candidate = {**cached_results}
+    for candidate, ranking_result in scored:
+        results_by_candidate[candidate['user_id']] = ranking_result
+    
     ranked_candidates = []
-    for candidate_id in candidate_ids:
-        candidate = await db.jobseeker_profiles.find_one({'user_id': candidate_id}, {'_id': 0})
-        if candidate:
-            ranking_result = calculate_ats_ranking(job, candidate)
-            ranked_candidates.append({
-                'candidate_id': candidate_id,
-                'candidate_name': f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}".strip(),
-                'current_position': candidate.get('current_position'),
-                'experience_years': candidate.get('experience_years'),
-                **ranking_result
-            })
+    for candidate in candidates:
+        if candidate['user_id'] not in results_by_candidate:
+            continue
+        ranked_candidates.append({
+            'candidate_id': candidate['user_id'],
+            'candidate_name': f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}".strip(),
+            'current_position': candidate.get('current_position'),
+            'experience_years': candidate.get('experience_years'),
+            **results_by_candidate[candidate['user_id']]
+        })
     
     # Sort by overall score (highest first)
     ranked_candidates.sort(key=lambda x: x['overall_score'], reverse=True)
+    if top_k is not None:
+        ranked_candidates = ranked_candidates[:top_k]
     
     return {
         'job_id': job_id,
         'job_title': job.get('title'),
         'total_candidates': len(ranked_candidates),
+        'candidates': ranked_candidates,
+        'cache': cache_stats
+    }
+
+
+@router.get('/ats/top-candidates/{job_id}')
+async def get_top_candidates_for_job(
+    job_id: str,
+    limit: int = 20,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Find the best-matching candidates for a job across the whole talent pool (employer feature)
+    Uses the inverted skill index, so candidates sharing no skills with the job are rarely scored
+    """
+    if not current_user or current_user.role != UserRole.EMPLOYER:
+        raise HTTPException(status_code=403, detail='Only employers can use this feature')
+    
+    limit = max(1, min(limit, 100))
+    
+    job = await db.jobs.find_one({'id': job_id}, {'_id': 0})
+    if not job:
+        raise HTTPException(status_code=404, detail='Job not found')
+    
+    if job.get('employer_id') != current_user.id:
+        raise HTTPException(status_code=403, detail='You can only rank candidates for your own jobs')
+    
+    await candidate_index.ensure_built(db)
+    await skill_dictionary.intern(db, job.get('required_skills') or [])
+    top_matches, candidates_scored = candidate_index.top_k(job, limit)
+    
+    # Load display fields for the selected candidates only
+    candidate_ids = [user_id for user_id, _ in top_matches]
+    display_projection = {field: 1 for field in ATS_CANDIDATE_PROJECTION if field != 'ats_features'}
+    profiles = await db.jobseeker_profiles.find({'user_id': {'$in': candidate_ids}}, display_projection).to_list(None)
+    profiles_by_user = {profile['user_id']: profile for profile in profiles}
+    
+    ranked_candidates = []
+    for candidate_id, ranking_result in top_matches:
+        candidate = profiles_by_user.get(candidate_id, {})
+        ranked_candidates.append({
+            'candidate_id': candidate_id,
+            'candidate_name': f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}".strip(),
+            'current_position': candidate.get('current_position'),
+            'experience_years': candidate.get('experience_years'),
+            **ranking_result
+        })
+    
+    return {
+        'job_id': job_id,
+        'job_title': job.get('job_title'),
+        'pool_size': len(candidate_index),
+        'candidates_scored': candidates_scored,
         'candidates': ranked_candidates
     }
+
+@router.get('/ats/rankings/{job_id}')
+async def get_job_ranking(
+    job_id: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Page through a job's applicants ranked by ATS score (employer feature)
+    Reads the materialized ranking with keyset cursors, so no applicant is
+    rescored per request and deep pages cost the same as the first
+    """
+    if not current_user or current_user.role != UserRole.EMPLOYER:
+        raise HTTPException(status_code=403, detail='Only employers can use this feature')
+    
+    limit = max(1, min(limit, 100))
+    
+    job = await db.jobs.find_one({'id': job_id}, {'_id': 0, 'employer_id': 1, 'job_title': 1})
+    if not job:
+        raise HTTPException(status_code=404, detail='Job not found')
+    
+    if job.get('employer_id') != current_user.id:
+        raise HTTPException(status_code=403, detail='You can only rank candidates for your own jobs')
+    
+    try:
+        query = build_ranking_query(job_id, cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail='Invalid cursor')
+    
+    # One extra entry tells whether there is a next page
+    entries = await db.job_rankings.find(
+        query,
+        {'_id': 0, 'job_id': 0, 'updated_at': 0}
+    ).sort(JOB_RANKING_SORT).limit(limit + 1).to_list(limit + 1)
+    cursor_after = next_cursor(entries, limit, 'overall_score', 'candidate_id')
+    
+    # Load display fields for this page only
+    candidate_ids = [entry['candidate_id'] for entry in entries]
+    display_projection = {field: 1 for field in ATS_CANDIDATE_PROJECTION if field != 'ats_features'}
+    profiles = await db.jobseeker_profiles.find({'user_id': {'$in': candidate_ids}}, display_projection).to_list(None)
+    profiles_by_user = {profile['user_id']: profile for profile in profiles}
+    
+    ranked_candidates = []
+    for entry in entries:
+        candidate = profiles_by_user.get(entry['candidate_id'], {})
+        ranked_candidates.append({
+            'candidate_id': entry.pop('candidate_id'),
+            'candidate_name': f"{candidate.get('first_name', '')} {candidate.get('last_name', '')}".strip(),
+            'current_position': candidate.get('current_position'),
+            'experience_years': candidate.get('experience_years'),
+            **entry
+        })
+    
+    # Counting grows with the ranking, so the total is opt-in
+    total = None
+    if include_total:
+        total = await db.job_rankings.count_documents({'job_id': job_id})
+    
+    return {
+        'job_id': job_id,
+        'job_title': job.get('job_title'),
+        'candidates': ranked_candidates,
+        'limit': limit,
+        'next_cursor': cursor_after,
+        'total': total
+    }
+
+@router.post('/ats/index/rebuild')
+async def rebuild_candidate_index(current_user: User = Depends(get_current_user)):
+    """Admin: Rebuild the candidate skill index from the database"""
+    if not current_user or current_user.role != UserRole.ADMIN:
+        raise HTTPException(status_code=403, detail='Admin access required')
+    
+    await candidate_index.rebuild(db)
+    
+    return {
+        'message': 'Candidate index rebuilt successfully',
+        'candidates': len(candidate_index),
+        'skills': len(candidate_index.postings)
+    }
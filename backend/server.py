@@ -195,6 +195,60 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Create missing indexes on startup (INDEX_AUTO_CREATE=false only reports them)
+INDEX_AUTO_CREATE = os.environ.get('INDEX_AUTO_CREATE', 'true').lower() == 'true'
+
+@app.on_event("startup")
+async def create_indexes():
+    from utils.indexes import ensure_indexes
+    try:
+        await ensure_indexes(db, dry_run=not INDEX_AUTO_CREATE)
+    except Exception as e:
+        logger.error(f"Failed to check indexes: {str(e)}")
+
+@app.on_event("startup")
+async def load_skill_dictionary():
+    from utils.skill_dictionary import skill_dictionary
+    try:
+        await skill_dictionary.load(db)
+    except Exception as e:
+        logger.error(f"Failed to load skill dictionary: {str(e)}")
+
+@app.on_event("startup")
+async def start_counter_flusher():
+    from utils.counters import job_counters
+    job_counters.start(db)
+
+@app.on_event("startup")
+async def start_summary_propagator():
+    from utils.application_summaries import application_summaries
+    application_summaries.start(db)
+
+@app.on_event("startup")
+async def start_ranking_refresher():
+    from utils.job_rankings import job_ranking_refresher
+    job_ranking_refresher.start(db)
+
+@app.on_event("shutdown")
+async def flush_counters():
+    from utils.counters import job_counters
+    await job_counters.stop(db)
+
+@app.on_event("shutdown")
+async def flush_summaries():
+    from utils.application_summaries import application_summaries
+    await application_summaries.stop(db)
+
+@app.on_event("shutdown")
+async def flush_ranking_refreshes():
+    from utils.job_rankings import job_ranking_refresher
+    await job_ranking_refresher.stop(db)
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    client.close()
+
+@app.on_event("shutdown")
+async def shutdown_ats_process_pool():
+    from utils.ats_parallel import shutdown_process_pool
+    shutdown_process_pool()
\ No newline at end of file
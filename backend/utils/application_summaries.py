@@ -0,0 +1,106 @@
+"""
+Denormalized job and applicant summaries on job applications
+Applications carry a copy of the job's title/company/location and the
+applicant's name/headline/location/experience, set at apply time, so
+application listings read a single collection. When a job or profile
+changes, the new summary is buffered and propagated to its applications
+in the background with one bulk_write per flush.
+"""
+
+from typing import Dict, Optional
+import logging
+import os
+
+from pymongo import UpdateMany
+
+from utils.periodic_flush import PeriodicFlusher
+
+logger = logging.getLogger(__name__)
+
+# Application field -> source job field
+JOB_SUMMARY_FIELDS = {
+    'job_title': 'job_title',
+    'company_name': 'company_name',
+    'location': 'location'
+}
+
+# Application field -> source job seeker profile field
+APPLICANT_SUMMARY_FIELDS = {
+    'applicant_name': 'full_name',
+    'applicant_headline': 'headline',
+    'applicant_location': 'location',
+    'applicant_experience': 'total_experience_years'
+}
+
+APPLICANT_SUMMARY_PROJECTION = {'_id': 0, 'user_id': 1, **{field: 1 for field in APPLICANT_SUMMARY_FIELDS.values()}}
+
+# Seconds between propagation flushes
+SUMMARY_FLUSH_INTERVAL = float(os.environ.get('SUMMARY_FLUSH_INTERVAL', '5'))
+
+def job_summary(job: Dict) -> Dict:
+    """Summary fields copied from a job onto its applications"""
+    return {field: job.get(source) for field, source in JOB_SUMMARY_FIELDS.items()}
+
+def applicant_summary(profile: Optional[Dict]) -> Dict:
+    """Summary fields copied from a job seeker profile onto their applications"""
+    profile = profile or {}
+    return {field: profile.get(source) for field, source in APPLICANT_SUMMARY_FIELDS.items()}
+
+class SummaryPropagator(PeriodicFlusher):
+    """
+    Buffered propagation of job/profile summaries to job_applications
+    
+    Only the latest summary per job and per applicant is kept, so a burst of
+    edits costs one update_many per source document. A failed flush keeps
+    its summaries (unless a newer one was buffered meanwhile) for the next
+    flush. Applications briefly show the previous summary until then.
+    """
+    
+    def __init__(self, flush_interval: float = SUMMARY_FLUSH_INTERVAL):
+        super().__init__(flush_interval)
+        self.pending_jobs: Dict[str, Dict] = {}
+        self.pending_applicants: Dict[str, Dict] = {}
+    
+    def job_changed(self, job: Dict):
+        """Queue a job's current summary for its applications"""
+        self.pending_jobs[job['id']] = job_summary(job)
+    
+    def profile_changed(self, profile: Dict):
+        """Queue a job seeker's current summary for their applications"""
+        self.pending_applicants[profile['user_id']] = applicant_summary(profile)
+    
+    async def flush(self, db) -> int:
+        """
+        Write all buffered summaries
+        
+        Returns:
+            Number of source documents propagated
+        """
+        if not self.pending_jobs and not self.pending_applicants:
+            return 0
+        
+        pending_jobs, self.pending_jobs = self.pending_jobs, {}
+        pending_applicants, self.pending_applicants = self.pending_applicants, {}
+        operations = [
+            UpdateMany({'job_id': job_id}, {'$set': summary})
+            for job_id, summary in pending_jobs.items()
+        ] + [
+            UpdateMany({'job_seeker_id': user_id}, {'$set': summary})
+            for user_id, summary in pending_applicants.items()
+        ]
+        
+        try:
+            await db.job_applications.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to propagate application summaries: {str(e)}")
+            # Retry next flush, unless a newer summary was queued meanwhile
+            for job_id, summary in pending_jobs.items():
+                self.pending_jobs.setdefault(job_id, summary)
+            for user_id, summary in pending_applicants.items():
+                self.pending_applicants.setdefault(user_id, summary)
+            return 0
+        
+        return len(operations)
+
+# Shared per-process propagator
+application_summaries = SummaryPropagator()
@@ -0,0 +1,134 @@
+"""
+Versioned ATS score cache
+Two layers (in-process LRU, then the `ats_score_cache` collection) keyed on
+(job revision, profile revision), so a (job, candidate) pair is only
+rescored after one of the two documents changed
+"""
+
+from typing import List, Dict, Tuple
+from datetime import datetime
+import logging
+import os
+
+from pymongo import UpdateOne
+
+from utils.cache import LRUCache
+from utils.ats_features import CURRENT_FEATURES_VERSION
+
+logger = logging.getLogger(__name__)
+
+ATS_CACHE_MEMORY_SIZE = int(os.environ.get('ATS_CACHE_MEMORY_SIZE', '100000'))
+# Seconds a stored score lives after it was last written (removed by a TTL index on updated_at)
+ATS_CACHE_STORE_TTL = int(os.environ.get('ATS_CACHE_STORE_TTL', str(30 * 24 * 3600)))
+
+class ATSScoreCache:
+    """
+    Cache of calculate_ats_ranking results for (job, candidate) pairs
+    
+    Entries are only valid for the job and profile revisions (and the ATS
+    feature version) they were computed from; the Mongo layer keeps one
+    document per pair and overwrites it when any of them moves. Stored
+    entries expire ATS_CACHE_STORE_TTL seconds after they were written.
+    """
+    
+    def __init__(self, memory_size: int = ATS_CACHE_MEMORY_SIZE):
+        self.memory = LRUCache(memory_size)
+    
+    @staticmethod
+    def _key(job: Dict, candidate: Dict) -> Tuple:
+        return (CURRENT_FEATURES_VERSION, job['id'], job.get('revision', 0), candidate['user_id'], candidate.get('revision', 0))
+    
+    async def lookup(self, db, job: Dict, candidates: List[Dict]) -> Tuple[Dict[str, Dict], Dict[str, int]]:
+        """
+        Find cached results for a job's candidates
+        
+        Args:
+            db: Database handle
+            job: Job document (id, revision)
+            candidates: Candidate profiles (user_id, revision)
+        
+        Returns:
+            Tuple of (results by candidate ID, hit/miss stats)
+        """
+        results = {}
+        memory_misses = []
+        for candidate in candidates:
+            result = self.memory.get(self._key(job, candidate))
+            if result is not None:
+                results[candidate['user_id']] = result
+            else:
+                memory_misses.append(candidate)
+        
+        store_hits = 0
+        if memory_misses:
+            revisions = {candidate['user_id']: candidate.get('revision', 0) for candidate in memory_misses}
+            stored = await db.ats_score_cache.find(
+                {
+                    'job_id': job['id'],
+                    'job_revision': job.get('revision', 0),
+                    'features_version': CURRENT_FEATURES_VERSION,
+                    'candidate_id': {'$in': list(revisions)}
+                },
+                {'_id': 0, 'candidate_id': 1, 'profile_revision': 1, 'result': 1}
+            ).to_list(None)
+            
+            for entry in stored:
+                candidate_id = entry['candidate_id']
+                if entry['profile_revision'] != revisions.get(candidate_id):
+                    continue
+                results[candidate_id] = entry['result']
+                self.memory.set(
+                    (CURRENT_FEATURES_VERSION, job['id'], job.get('revision', 0), candidate_id, entry['profile_revision']),
+                    entry['result']
+                )
+                store_hits += 1
+        
+        memory_hits = len(candidates) - len(memory_misses)
+        stats = {
+            'hits': memory_hits + store_hits,
+            'memory_hits': memory_hits,
+            'store_hits': store_hits,
+            'misses': len(candidates) - memory_hits - store_hits
+        }
+        return results, stats
+    
+    async def store(self, db, job: Dict, candidates: List[Dict], results: List[Dict]):
+        """
+        Store freshly computed results in both layers
+        
+        Args:
+            db: Database handle
+            job: Job document (id, revision)
+            candidates: Candidate profiles (user_id, revision)
+            results: Ranking results, in the same order as candidates
+        """
+        if not candidates:
+            return
+        
+        now = datetime.utcnow()
+        operations = []
+        for candidate, result in zip(candidates, results):
+            self.memory.set(self._key(job, candidate), result)
+            operations.append(UpdateOne(
+                {'job_id': job['id'], 'candidate_id': candidate['user_id']},
+                {'$set': {
+                    'job_revision': job.get('revision', 0),
+                    'profile_revision': candidate.get('revision', 0),
+                    'features_version': CURRENT_FEATURES_VERSION,
+                    'result': result,
+                    'updated_at': now
+                }},
+                upsert=True
+            ))
+        
+        try:
+            await db.ats_score_cache.bulk_write(operations, ordered=False)
+        except Exception as e:
+            logger.error(f"Failed to store ATS scores in cache: {str(e)}")
+
+    async def discard_job(self, db, job_id: str):
+        """Drop a job's stored scores (the job was deleted)"""
+        await db.ats_score_cache.delete_many({'job_id': job_id})
+
+# Shared per-process cache
+ats_score_cache = ATSScoreCache()
@@ -0,0 +1,117 @@
+"""
+Precomputed ATS features for job seeker profiles
+Stores the normalized fields the ATS sub-scores need in a compact
+`ats_features` sub-document so ranking doesn't re-derive them per call
+"""
+
+from typing import List, Dict
+import logging
+
+from pymongo import UpdateOne
+
+from utils.ats_ranking import extract_ats_features
+from utils.skill_dictionary import skill_dictionary
+
+logger = logging.getLogger(__name__)
+
+# Bump when the shape or derivation of ats_features changes
+ATS_FEATURES_VERSION = 2
+
+# Version stored on features: skill aliases are resolved into the stored
+# skill IDs, so features built with another alias map are stale as well
+CURRENT_FEATURES_VERSION = f"{ATS_FEATURES_VERSION}:{skill_dictionary.aliases_hash}"
+
+# Raw profile fields the features are derived from
+ATS_SOURCE_FIELDS = [
+    'primary_skills',
+    'experience_years',
+    'preferred_locations',
+    'willing_to_relocate',
+    'education'
+]
+
+# Fields loaded for ranking: display fields plus the precomputed features
+ATS_CANDIDATE_PROJECTION = {
+    '_id': 0,
+    'user_id': 1,
+    'first_name': 1,
+    'last_name': 1,
+    'current_position': 1,
+    'experience_years': 1,
+    'revision': 1,
+    'ats_features': 1
+}
+
+def build_ats_features(profile: Dict) -> Dict:
+    """
+    Build the ats_features sub-document for a profile
+    
+    Args:
+        profile: Full (or merged) job seeker profile dictionary
+    
+    Returns:
+        Dictionary to store under the profile's `ats_features` field
+    """
+    return {
+        **extract_ats_features(profile),
+        'version': CURRENT_FEATURES_VERSION
+    }
+
+async def compute_ats_features(db, profile: Dict) -> Dict:
+    """
+    Intern a profile's skills, then build its ats_features sub-document
+    
+    Use this instead of build_ats_features() whenever the features are
+    stored, so the skill IDs written are the shared database-backed ones.
+    """
+    await skill_dictionary.intern(db, profile.get('primary_skills') or [])
+    return build_ats_features(profile)
+
+def has_current_features(profile: Dict) -> bool:
+    """Check whether a profile has up-to-date precomputed features"""
+    features = profile.get('ats_features')
+    return bool(features) and features.get('version') == CURRENT_FEATURES_VERSION
+
+async def load_ats_candidates(db, query: Dict) -> List[Dict]:
+    """
+    Load candidate profiles for ranking through the compact projection
+    
+    Profiles without current features (created before they existed) are
+    read once more with their raw fields, and their features are computed
+    and written back so the next load is projection-only.
+    
+    Args:
+        db: Database handle
+        query: Filter on jobseeker_profiles
+    
+    Returns:
+        List of projected profiles, each with a current `ats_features` field
+    """
+    profiles = await db.jobseeker_profiles.find(query, ATS_CANDIDATE_PROJECTION).to_list(None)
+    
+    stale_ids = [profile['user_id'] for profile in profiles if not has_current_features(profile)]
+    if not stale_ids:
+        return profiles
+    
+    source_projection = {'_id': 0, 'user_id': 1, **{field: 1 for field in ATS_SOURCE_FIELDS}}
+    sources = await db.jobseeker_profiles.find({'user_id': {'$in': stale_ids}}, source_projection).to_list(None)
+    await skill_dictionary.intern(db, [skill for source in sources for skill in source.get('primary_skills') or []])
+    
+    features_by_user = {source['user_id']: build_ats_features(source) for source in sources}
+    for profile in profiles:
+        if profile['user_id'] in features_by_user:
+            profile['ats_features'] = features_by_user[profile['user_id']]
+    
+    # Backfill so later loads skip the raw fields
+    if not features_by_user:
+        return profiles
+    
+    try:
+        await db.jobseeker_profiles.bulk_write([
+            UpdateOne({'user_id': user_id}, {'$set': {'ats_features': features}})
+            for user_id, features in features_by_user.items()
+        ], ordered=False)
+    except Exception as e:
+        logger.error(f"Failed to backfill ATS features: {str(e)}")
+    
+    return profiles
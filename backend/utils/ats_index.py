@@ -0,0 +1,333 @@
+"""
+In-memory inverted skill indexes for ATS matching
+CandidateIndex maps interned skill IDs to candidate IDs (best candidates for
+a job), JobIndex maps them to active job IDs (best jobs for a candidate).
+Both use score upper bounds (WAND-style pruning) so most documents are never scored
+"""
+
+from typing import List, Dict, Optional, Set, Tuple
+from collections import defaultdict
+from datetime import datetime
+import asyncio
+import heapq
+import logging
+import os
+
+from utils.ats_features import load_ats_candidates
+from utils.ats_ranking import (
+    DEFAULT_WEIGHTS,
+    prepare_job,
+    calculate_ats_scores,
+    calculate_ats_scores_batch,
+    build_ranking_results,
+    _build_ranking_result
+)
+from utils.cache import LRUCache
+from utils.skill_dictionary import skill_dictionary
+
+logger = logging.getLogger(__name__)
+
+# Rebuild from Mongo after this many seconds, so writes handled by other
+# server processes are eventually picked up
+CANDIDATE_INDEX_MAX_AGE = int(os.environ.get('CANDIDATE_INDEX_MAX_AGE', '600'))
+JOB_INDEX_MAX_AGE = int(os.environ.get('JOB_INDEX_MAX_AGE', '300'))
+
+# Job fields needed to prepare a job for ATS scoring
+JOB_ATS_PROJECTION = {
+    '_id': 0,
+    'id': 1,
+    'required_skills': 1,
+    'min_experience': 1,
+    'location': 1,
+    'education_required': 1
+}
+
+def _upper_bound(skills_score: float, weights: Dict[str, float]) -> float:
+    """Best overall score reachable with this skills score (other factors at 100)"""
+    return (
+        (skills_score * weights['skills']) +
+        (100.0 * weights['experience']) +
+        (100.0 * weights['location']) +
+        (100.0 * weights['education'])
+    )
+
+class CandidateIndex:
+    """
+    Inverted index from skill ID to candidate user IDs
+    
+    Holds each candidate's precomputed ATS features so candidates can be
+    scored without going back to Mongo.
+    """
+    
+    def __init__(self, max_age: int = CANDIDATE_INDEX_MAX_AGE):
+        self.postings: Dict[int, Set[str]] = defaultdict(set)
+        self.features: Dict[str, Dict] = {}
+        self.built_at: Optional[datetime] = None
+        self.max_age = max_age
+        self._lock = asyncio.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.features)
+    
+    def update(self, user_id: str, features: Dict):
+        """Add or replace a candidate's features"""
+        self.remove(user_id)
+        self.features[user_id] = features
+        for skill_id in features['skill_ids']:
+            self.postings[skill_id].add(user_id)
+    
+    def remove(self, user_id: str):
+        """Remove a candidate from the index"""
+        old_features = self.features.pop(user_id, None)
+        if not old_features:
+            return
+        for skill_id in old_features['skill_ids']:
+            posting = self.postings.get(skill_id)
+            if posting is not None:
+                posting.discard(user_id)
+                if not posting:
+                    del self.postings[skill_id]
+    
+    def refresh(self, user_id: str, features: Dict):
+        """Apply a profile write; skipped until the index has been built"""
+        if self.built_at is not None:
+            self.update(user_id, features)
+    
+    async def rebuild(self, db):
+        """Rebuild the whole index from jobseeker_profiles"""
+        async with self._lock:
+            profiles = await load_ats_candidates(db, {})
+            self.postings = defaultdict(set)
+            self.features = {}
+            for profile in profiles:
+                self.update(profile['user_id'], profile['ats_features'])
+            self.built_at = datetime.utcnow()
+            logger.info(f"Candidate skill index rebuilt: {len(self.features)} candidates, {len(self.postings)} skills")
+    
+    async def ensure_built(self, db):
+        """Build the index on first use and whenever it is older than max_age"""
+        if self.built_at is None or (datetime.utcnow() - self.built_at).total_seconds() > self.max_age:
+            await self.rebuild(db)
+    
+    def top_k(
+        self,
+        job_data: Dict,
+        k: int,
+        weights: Optional[Dict[str, float]] = None
+    ) -> Tuple[List[Tuple[str, Dict]], int]:
+        """
+        Find the k best-matching candidates for a job
+        
+        Candidates are grouped by how many job skills they match, which
+        fixes their skills score exactly. Groups are scored best-first and
+        the search stops once a group's upper bound can't beat the current
+        k-th best score, so candidates sharing no skills with the job are
+        usually never scored.
+        
+        Args:
+            job_data: Dictionary containing job requirements
+            k: Number of candidates to return
+            weights: Optional custom weights for different factors
+        
+        Returns:
+            Tuple of ([(user_id, ranking_result)] best first, number of candidates scored)
+        """
+        if weights is None:
+            weights = DEFAULT_WEIGHTS
+        
+        job = prepare_job(job_data)
+        
+        # Accumulate matched-skill counts from the job's posting lists
+        match_counts: Dict[str, int] = defaultdict(int)
+        for skill_id in job['skill_ids']:
+            for user_id in self.postings.get(skill_id, ()):
+                match_counts[user_id] += 1
+        
+        groups: Dict[int, List[str]] = defaultdict(list)
+        for user_id, matched in match_counts.items():
+            groups[matched].append(user_id)
+        
+        # Everyone else matches no job skill; scored only if still needed
+        groups[0] = [user_id for user_id in self.features if user_id not in match_counts]
+        
+        heap: List[Tuple[float, str, Dict]] = []
+        scored = 0
+        for matched in sorted(groups, reverse=True):
+            user_ids = groups[matched]
+            if not user_ids:
+                continue
+            
+            if job['skill_count']:
+                skills_bound = round((matched / job['skill_count']) * 100, 2)
+            else:
+                skills_bound = 100.0
+            if len(heap) >= k and round(_upper_bound(skills_bound, weights), 2) <= heap[0][0]:
+                break
+            
+            scores = calculate_ats_scores_batch(job, [self.features[user_id] for user_id in user_ids])
+            scored += len(user_ids)
+            for user_id, result in zip(user_ids, build_ranking_results(scores, weights)):
+                entry = (result['overall_score'], user_id, result)
+                if len(heap) < k:
+                    heapq.heappush(heap, entry)
+                elif entry[0] > heap[0][0]:
+                    heapq.heapreplace(heap, entry)
+        
+        best = sorted(heap, key=lambda entry: (-entry[0], entry[1]))
+        return [(user_id, result) for _, user_id, result in best], scored
+
+class JobIndex:
+    """
+    Inverted index from skill ID to active job IDs
+    
+    Holds each active job in prepared form, and caches each job seeker's
+    recommendations until their profile changes or the set of jobs changes.
+    """
+    
+    def __init__(self, max_age: int = JOB_INDEX_MAX_AGE, cache_size: int = 10000):
+        self.postings: Dict[int, Set[str]] = defaultdict(set)
+        self.jobs: Dict[str, Dict] = {}
+        self.built_at: Optional[datetime] = None
+        self.max_age = max_age
+        # Bumped on every job change; cached recommendations from an older version are stale
+        self.version = 0
+        self.recommendations = LRUCache(cache_size)
+        self._lock = asyncio.Lock()
+    
+    def __len__(self) -> int:
+        return len(self.jobs)
+    
+    def update(self, job_data: Dict):
+        """Add, replace or (if no longer active) remove a job"""
+        self.remove(job_data['id'])
+        if job_data.get('status', 'active') != 'active':
+            return
+        job = prepare_job(job_data)
+        self.jobs[job_data['id']] = job
+        for skill_id in job['skill_ids']:
+            self.postings[skill_id].add(job_data['id'])
+        self.version += 1
+    
+    def remove(self, job_id: str):
+        """Remove a job from the index"""
+        old_job = self.jobs.pop(job_id, None)
+        if not old_job:
+            return
+        for skill_id in old_job['skill_ids']:
+            posting = self.postings.get(skill_id)
+            if posting is not None:
+                posting.discard(job_id)
+                if not posting:
+                    del self.postings[skill_id]
+        self.version += 1
+    
+    def refresh(self, job_data: Dict):
+        """Apply a job write; skipped until the index has been built"""
+        if self.built_at is not None:
+            self.update(job_data)
+    
+    def discard(self, job_id: str):
+        """Apply a job deletion; skipped until the index has been built"""
+        if self.built_at is not None:
+            self.remove(job_id)
+    
+    def invalidate_user(self, user_id: str):
+        """Drop a job seeker's cached recommendations (their profile changed)"""
+        self.recommendations.delete(user_id)
+    
+    async def rebuild(self, db):
+        """Rebuild the whole index from active jobs"""
+        async with self._lock:
+            jobs = await db.jobs.find({'status': 'active'}, JOB_ATS_PROJECTION).to_list(None)
+            await skill_dictionary.intern(db, [skill for job_data in jobs for skill in job_data.get('required_skills') or []])
+            self.postings = defaultdict(set)
+            self.jobs = {}
+            for job_data in jobs:
+                self.update(job_data)
+            self.version += 1
+            self.built_at = datetime.utcnow()
+            logger.info(f"Job skill index rebuilt: {len(self.jobs)} jobs, {len(self.postings)} skills")
+    
+    async def ensure_built(self, db):
+        """Build the index on first use and whenever it is older than max_age"""
+        if self.built_at is None or (datetime.utcnow() - self.built_at).total_seconds() > self.max_age:
+            await self.rebuild(db)
+    
+    def get_cached(self, user_id: str) -> Optional[List[Tuple[str, Dict]]]:
+        """Cached recommendations for a job seeker, if still current"""
+        cached = self.recommendations.get(user_id)
+        if cached is None or cached[0] != self.version:
+            return None
+        return cached[1]
+    
+    def recommend(
+        self,
+        user_id: str,
+        features: Dict,
+        n: int,
+        weights: Optional[Dict[str, float]] = None
+    ) -> List[Tuple[str, Dict]]:
+        """
+        Find the n active jobs a candidate matches best
+        
+        Each job's skills score is known from its matched-skill count, so jobs
+        are visited in descending upper-bound order with a bounded heap of the
+        best n, stopping once no remaining job can enter the heap.
+        
+        Args:
+            user_id: Job seeker user ID (cache key)
+            features: Candidate features from extract_ats_features()
+            n: Number of jobs to return
+            weights: Optional custom weights for different factors
+        
+        Returns:
+            List of (job_id, ranking_result), best first
+        """
+        if weights is None:
+            weights = DEFAULT_WEIGHTS
+        
+        match_counts: Dict[str, int] = defaultdict(int)
+        for skill_id in features['skill_ids']:
+            for job_id in self.postings.get(skill_id, ()):
+                match_counts[job_id] += 1
+        
+        # Skills score per job: exact for jobs sharing skills or without required skills
+        bounded: List[Tuple[float, str]] = []
+        unmatched: List[str] = []
+        for job_id, job in self.jobs.items():
+            if not job['skill_count']:
+                skills_score = 100.0
+            elif job_id in match_counts:
+                skills_score = round((match_counts[job_id] / job['skill_count']) * 100, 2)
+            else:
+                unmatched.append(job_id)
+                continue
+            bounded.append((round(_upper_bound(skills_score, weights), 2), job_id))
+        bounded.sort(reverse=True)
+        
+        # Jobs sharing no skills all have the same (lowest) bound
+        unmatched_bound = round(_upper_bound(0.0, weights), 2)
+        bounded.extend((unmatched_bound, job_id) for job_id in unmatched)
+        
+        heap: List[Tuple[float, str, Dict]] = []
+        for bound, job_id in bounded:
+            if len(heap) >= n and bound <= heap[0][0]:
+                break
+            scores = calculate_ats_scores(self.jobs[job_id], features)
+            result = _build_ranking_result(
+                scores['skills'], scores['experience'], scores['location'], scores['education'], weights
+            )
+            entry = (result['overall_score'], job_id, result)
+            if len(heap) < n:
+                heapq.heappush(heap, entry)
+            elif entry[0] > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+        
+        best = sorted(heap, key=lambda entry: (-entry[0], entry[1]))
+        recommendations = [(job_id, result) for _, job_id, result in best]
+        self.recommendations.set(user_id, (self.version, recommendations))
+        return recommendations
+
+# Shared per-process indexes
+candidate_index = CandidateIndex()
+job_index = JobIndex()
@@ -0,0 +1,134 @@
+"""
+Process-pool execution for large ATS ranking jobs
+Small candidate sets are scored in-process; large ones are split into
+chunks, scored in parallel across cores and merged with a streaming top-K
+so the event loop stays responsive
+"""
+
+from typing import List, Dict, Optional, Tuple
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import heapq
+import logging
+import os
+
+from utils.ats_ranking import (
+    DEFAULT_WEIGHTS,
+    prepare_job,
+    extract_ats_features,
+    calculate_ats_scores_batch,
+    build_ranking_results,
+    calculate_ats_ranking_batch
+)
+
+logger = logging.getLogger(__name__)
+
+# Candidate sets at least this large are sent to the process pool
+ATS_PROCESS_POOL_THRESHOLD = int(os.environ.get('ATS_PROCESS_POOL_THRESHOLD', '10000'))
+# Number of worker processes (0 = one per CPU core)
+ATS_PROCESS_POOL_WORKERS = int(os.environ.get('ATS_PROCESS_POOL_WORKERS', '0'))
+# Candidates per task sent to a worker
+ATS_PROCESS_POOL_CHUNK_SIZE = int(os.environ.get('ATS_PROCESS_POOL_CHUNK_SIZE', '5000'))
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared process pool, creating it on first use"""
+    global _executor
+    if _executor is None:
+        workers = ATS_PROCESS_POOL_WORKERS or os.cpu_count() or 1
+        _executor = ProcessPoolExecutor(max_workers=workers)
+        logger.info(f"ATS process pool started with {workers} workers")
+    return _executor
+
+def shutdown_process_pool():
+    """Shut down the shared process pool (called on application shutdown)"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=True, cancel_futures=True)
+        _executor = None
+
+def _score_chunk(
+    job: Dict,
+    features: List[Dict],
+    weights: Dict[str, float],
+    top_k: Optional[int]
+) -> List[Tuple[int, Dict]]:
+    """
+    Score one chunk of candidates (runs in a worker process)
+    
+    The job is prepared in the parent so workers never need the parent's
+    skill dictionary.
+    
+    Returns:
+        List of (index within chunk, ranking_result), only the chunk's best top_k if given
+    """
+    results = build_ranking_results(calculate_ats_scores_batch(job, features), weights)
+    indexed = list(enumerate(results))
+    if top_k is not None:
+        indexed = heapq.nlargest(top_k, indexed, key=lambda item: item[1]['overall_score'])
+    return indexed
+
+async def rank_candidates(
+    job_data: Dict,
+    candidates: List[Dict],
+    weights: Optional[Dict[str, float]] = None,
+    top_k: Optional[int] = None
+) -> List[Optional[Dict]]:
+    """
+    Calculate ATS rankings for candidates, in a process pool for large sets
+    
+    Args:
+        job_data: Dictionary containing job requirements
+        candidates: Candidate profiles (with or without precomputed ats_features)
+        weights: Optional custom weights for different factors
+        top_k: Only the best top_k results are needed; on the process-pool
+            path the other candidates are not returned
+    
+    Returns:
+        Ranking results aligned with candidates (None for candidates dropped by top_k)
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    
+    if len(candidates) < ATS_PROCESS_POOL_THRESHOLD:
+        return calculate_ats_ranking_batch(job_data, candidates, weights)
+    
+    job = prepare_job(job_data)
+    features = [
+        candidate.get('ats_features') or extract_ats_features(candidate)
+        for candidate in candidates
+    ]
+    
+    loop = asyncio.get_running_loop()
+    executor = get_process_pool()
+    chunk_size = max(1, ATS_PROCESS_POOL_CHUNK_SIZE)
+    
+    async def run_chunk(offset: int):
+        chunk_results = await loop.run_in_executor(
+            executor, _score_chunk, job, features[offset:offset + chunk_size], weights, top_k
+        )
+        return offset, chunk_results
+    
+    tasks = [run_chunk(offset) for offset in range(0, len(features), chunk_size)]
+    
+    # Merge chunks as they finish, keeping only the best top_k so far
+    results: List[Optional[Dict]] = [None] * len(candidates)
+    heap: List[Tuple[float, int]] = []
+    for finished in asyncio.as_completed(tasks):
+        offset, chunk_results = await finished
+        for chunk_index, result in chunk_results:
+            index = offset + chunk_index
+            if top_k is None:
+                results[index] = result
+                continue
+            entry = (result['overall_score'], -index)
+            if len(heap) < top_k:
+                heapq.heappush(heap, entry)
+                results[index] = result
+            elif entry > heap[0]:
+                _, dropped = heapq.heapreplace(heap, entry)
+                results[-dropped] = None
+                results[index] = result
+    
+    return results
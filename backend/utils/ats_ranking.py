@@ -3,9 +3,33 @@ ATS (Applicant Tracking System) Ranking Algorithm
 Matches job requirements with candidate profiles and provides scoring
 """
 
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, FrozenSet
+from functools import lru_cache
 import re
 
+import numpy as np
+
+from utils.skill_dictionary import skill_dictionary
+
+# Default weights (must sum to 1.0)
+DEFAULT_WEIGHTS = {
+    'skills': 0.40,      # 40% weight on skills
+    'experience': 0.30,  # 30% weight on experience
+    'location': 0.15,    # 15% weight on location
+    'education': 0.15    # 15% weight on education
+}
+
+# Education keywords mapped to levels, checked in this order
+EDUCATION_LEVELS = {
+    'high school': 1,
+    'diploma': 2,
+    'associate': 3,
+    'bachelor': 4,
+    'master': 5,
+    'phd': 6,
+    'doctorate': 6
+}
+
 def calculate_skills_match(job_skills: List[str], candidate_skills: List[str]) -> float:
     """
     Calculate skills match percentage
@@ -17,15 +41,15 @@ def calculate_skills_match(job_skills: List[str], candidate_skills: List[str]) -
     if not candidate_skills:
         return 0.0
     
-    # Normalize skills to lowercase for comparison
-    job_skills_lower = [skill.lower().strip() for skill in job_skills]
-    candidate_skills_lower = [skill.lower().strip() for skill in candidate_skills]
+    # Normalize skills and resolve aliases for comparison
+    job_skills_canonical = [skill_dictionary.canonical(skill) for skill in job_skills]
+    candidate_skills_canonical = [skill_dictionary.canonical(skill) for skill in candidate_skills]
     
     # Find matching skills
-    matched_skills = set(job_skills_lower) & set(candidate_skills_lower)
+    matched_skills = set(job_skills_canonical) & set(candidate_skills_canonical)
     
     # Calculate percentage
-    match_percentage = (len(matched_skills) / len(job_skills_lower)) * 100
+    match_percentage = (len(matched_skills) / len(job_skills_canonical)) * 100
     
     return round(match_percentage, 2)
 
@@ -85,6 +109,55 @@ def calculate_location_match(job_location: str, candidate_locations: List[str],
     # No match but has location preferences
     return 30.0
 
+# All education keywords in one pass: a lookahead at every position finds
+# overlapping occurrences, longest keyword first at each position
+_EDUCATION_PATTERN = re.compile(
+    '(?=(' + '|'.join(re.escape(name) for name in sorted(EDUCATION_LEVELS, key=len, reverse=True)) + '))'
+)
+
+# A keyword found at some position implies every keyword that is a prefix of it
+_EDUCATION_IMPLIED = {
+    name: [other for other in EDUCATION_LEVELS if name.startswith(other)]
+    for name in EDUCATION_LEVELS
+}
+
+@lru_cache(maxsize=4096)
+def _education_keywords(text_lower: str) -> FrozenSet[str]:
+    """Education keywords contained in a lowercased string (memoized)"""
+    found = set()
+    for match in _EDUCATION_PATTERN.finditer(text_lower):
+        found.update(_EDUCATION_IMPLIED[match.group(1)])
+    return frozenset(found)
+
+@lru_cache(maxsize=4096)
+def _required_level(text_lower: str) -> int:
+    keywords = _education_keywords(text_lower)
+    for level_name, level_value in EDUCATION_LEVELS.items():
+        if level_name in keywords:
+            return level_value
+    return 0
+
+@lru_cache(maxsize=4096)
+def _degree_level(degree_lower: str) -> int:
+    return max((EDUCATION_LEVELS[name] for name in _education_keywords(degree_lower)), default=0)
+
+def get_required_education_level(required_education: str) -> int:
+    """
+    Get the level of an education requirement (first keyword found wins)
+    Returns: Level between 1-6, or 0 if it can't be determined
+    """
+    return _required_level(required_education.lower())
+
+def get_highest_education_level(candidate_education: List[Dict]) -> int:
+    """
+    Get the highest education level across a candidate's degrees
+    Returns: Level between 1-6, or 0 if none can be determined
+    """
+    highest_level = 0
+    for edu in candidate_education:
+        highest_level = max(highest_level, _degree_level(edu.get('degree', '').lower()))
+    return highest_level
+
 def calculate_education_match(required_education: Optional[str], candidate_education: Optional[List[Dict]]) -> float:
     """
     Calculate education match score
@@ -96,33 +169,13 @@ def calculate_education_match(required_education: Optional[str], candidate_educa
     if not candidate_education:
         return 60.0  # Neutral if no education data
     
-    education_levels = {
-        'high school': 1,
-        'diploma': 2,
-        'associate': 3,
-        'bachelor': 4,
-        'master': 5,
-        'phd': 6,
-        'doctorate': 6
-    }
-    
-    required_level = 0
-    required_lower = required_education.lower()
-    for level_name, level_value in education_levels.items():
-        if level_name in required_lower:
-            required_level = level_value
-            break
+    required_level = get_required_education_level(required_education)
     
     if required_level == 0:
         return 80.0  # Can't determine required level
     
     # Check candidate's highest education
-    highest_candidate_level = 0
-    for edu in candidate_education:
-        degree = edu.get('degree', '').lower()
-        for level_name, level_value in education_levels.items():
-            if level_name in degree:
-                highest_candidate_level = max(highest_candidate_level, level_value)
+    highest_candidate_level = get_highest_education_level(candidate_education)
     
     if highest_candidate_level >= required_level:
         return 100.0
@@ -147,14 +200,8 @@ def calculate_ats_ranking(
     Returns:
         Dictionary with scores and overall ranking
     """
-    # Default weights (must sum to 1.0)
     if weights is None:
-        weights = {
-            'skills': 0.40,      # 40% weight on skills
-            'experience': 0.30,  # 30% weight on experience
-            'location': 0.15,    # 15% weight on location
-            'education': 0.15    # 15% weight on education
-        }
+        weights = DEFAULT_WEIGHTS
     
     # Calculate individual scores
     skills_score = calculate_skills_match(
@@ -178,6 +225,18 @@ def calculate_ats_ranking(
         candidate_profile.get('education', None)
     )
     
+    return _build_ranking_result(skills_score, experience_score, location_score, education_score, weights)
+
+def _build_ranking_result(
+    skills_score: float,
+    experience_score: float,
+    location_score: float,
+    education_score: float,
+    weights: Dict[str, float]
+) -> Dict:
+    """
+    Combine the four sub-scores into the ranking result returned by the API
+    """
     # Calculate weighted overall score
     overall_score = (
         (skills_score * weights['skills']) +
@@ -227,3 +286,296 @@ def calculate_ats_ranking(
             }
         }
     }
+
+# ==================== Batch Scoring ====================
+
+def prepare_job(job_data: Dict) -> Dict:
+    """
+    Normalize the job side of the ATS comparison once so it can be reused
+    for every candidate
+    
+    Required skills are mapped to interned skill IDs; a skill the dictionary
+    has never seen can't be matched by any candidate, so it only counts
+    towards the denominator.
+    
+    Args:
+        job_data: Dictionary containing job requirements
+    
+    Returns:
+        Dictionary with normalized job requirements
+    """
+    job_skills = job_data.get('required_skills', [])
+    job_location = job_data.get('location', '')
+    required_education = job_data.get('education_required', None)
+    
+    # Unique skill IDs, keeping the job's order
+    skill_ids = skill_dictionary.get_ids(job_skills or [])
+    
+    return {
+        'skill_ids': skill_ids,
+        # Duplicates count towards the denominator, as in calculate_skills_match
+        'skill_count': len(job_skills) if job_skills else 0,
+        'min_experience': job_data.get('min_experience', 0),
+        'has_location': bool(job_location),
+        'location': job_location.lower().strip() if job_location else '',
+        'has_education': bool(required_education),
+        'education_level': get_required_education_level(required_education) if required_education else 0
+    }
+
+def extract_ats_features(candidate_profile: Dict) -> Dict:
+    """
+    Extract the normalized candidate fields the ATS sub-scores depend on
+    
+    Args:
+        candidate_profile: Dictionary containing candidate profile data
+    
+    Returns:
+        Dictionary with skill IDs, experience, locations and education level
+    """
+    candidate_skills = candidate_profile.get('primary_skills', [])
+    candidate_locations = candidate_profile.get('preferred_locations', [])
+    candidate_education = candidate_profile.get('education', None)
+    
+    return {
+        'skill_ids': sorted(skill_dictionary.get_ids(candidate_skills or [])),
+        'experience_years': candidate_profile.get('experience_years', 0),
+        'locations': [loc.lower().strip() for loc in candidate_locations or []],
+        'willing_to_relocate': bool(candidate_profile.get('willing_to_relocate', False)),
+        # None means no education data at all (neutral score)
+        'education_level': get_highest_education_level(candidate_education) if candidate_education else None
+    }
+
+def _round_scores(values: np.ndarray) -> np.ndarray:
+    """Round element-wise with Python's round() so results match the scalar functions"""
+    # Scores take few distinct values, so only round each distinct value once
+    unique_values, inverse = np.unique(values, return_inverse=True)
+    rounded = np.array([round(value, 2) for value in unique_values.tolist()], dtype=np.float64)
+    return rounded[inverse.reshape(-1)]
+
+def _location_match_level(job_location: str, location: str) -> int:
+    """Match level of one normalized location: 2 = exact, 1 = partial, 0 = no match"""
+    if location == job_location:
+        return 2
+    if job_location in location or location in job_location:
+        return 1
+    return 0
+
+def _batch_skills_scores(job: Dict, features: List[Dict]) -> np.ndarray:
+    """Skills match for every candidate from matched skill-ID counts"""
+    count = len(features)
+    if not job['skill_count']:
+        return np.full(count, 100.0)
+    
+    job_skill_ids = frozenset(job['skill_ids'])
+    matched = np.fromiter(
+        (len(job_skill_ids.intersection(feature['skill_ids'])) for feature in features),
+        dtype=np.int64,
+        count=count
+    )
+    has_skills = np.fromiter((bool(feature['skill_ids']) for feature in features), dtype=bool, count=count)
+    
+    scores = _round_scores((matched / job['skill_count']) * 100)
+    return np.where(has_skills, scores, 0.0)
+
+def _batch_experience_scores(job: Dict, features: List[Dict]) -> np.ndarray:
+    """Experience match for every candidate over an experience vector"""
+    count = len(features)
+    required = job['min_experience']
+    if required == 0:
+        return np.full(count, 100.0)
+    
+    experience = np.array([feature['experience_years'] for feature in features], dtype=np.float64)
+    underqualified = _round_scores((experience / required) * 100)
+    scores = np.where(experience >= required, 100.0, underqualified)
+    return np.where(experience == 0, 0.0, scores)
+
+def _batch_location_scores(job: Dict, features: List[Dict]) -> np.ndarray:
+    """Location match for every candidate using integer location codes"""
+    count = len(features)
+    if not job['has_location']:
+        return np.full(count, 100.0)
+    
+    job_location = job['location']
+    
+    # Encode each distinct location once with its match level
+    location_codes = {}
+    match_levels = []
+    owners, codes = [], []
+    relocate = np.zeros(count, dtype=bool)
+    has_locations = np.zeros(count, dtype=bool)
+    for row, feature in enumerate(features):
+        relocate[row] = feature['willing_to_relocate']
+        if feature['locations']:
+            has_locations[row] = True
+        for location in feature['locations']:
+            code = location_codes.get(location)
+            if code is None:
+                code = len(match_levels)
+                location_codes[location] = code
+                match_levels.append(_location_match_level(job_location, location))
+            owners.append(row)
+            codes.append(code)
+    
+    best_match = np.zeros(count, dtype=np.int8)
+    if codes:
+        np.maximum.at(best_match, np.array(owners), np.array(match_levels, dtype=np.int8)[codes])
+    
+    scores = np.select([best_match == 2, best_match == 1], [100.0, 85.0], default=30.0)
+    scores = np.where(has_locations, scores, 50.0)
+    return np.where(relocate, 100.0, scores)
+
+def _batch_education_scores(job: Dict, features: List[Dict]) -> np.ndarray:
+    """Education match for every candidate over an education-level vector"""
+    count = len(features)
+    if not job['has_education']:
+        return np.full(count, 100.0)
+    
+    has_education = np.array([feature['education_level'] is not None for feature in features], dtype=bool)
+    required_level = job['education_level']
+    if required_level == 0:
+        return np.where(has_education, 80.0, 60.0)
+    
+    levels = np.array([feature['education_level'] or 0 for feature in features], dtype=np.int64)
+    scores = np.maximum(50.0, (levels / required_level) * 100)
+    scores = np.where(levels == required_level - 1, 85.0, scores)
+    scores = np.where(levels >= required_level, 100.0, scores)
+    return np.where(has_education, scores, 60.0)
+
+def calculate_ats_scores_batch(job: Dict, features: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Calculate the four ATS sub-scores for many candidates at once
+    
+    Args:
+        job: Prepared job from prepare_job()
+        features: Candidate features from extract_ats_features()
+    
+    Returns:
+        Dictionary of score arrays keyed by factor
+    """
+    return {
+        'skills': _batch_skills_scores(job, features),
+        'experience': _batch_experience_scores(job, features),
+        'location': _batch_location_scores(job, features),
+        'education': _batch_education_scores(job, features)
+    }
+
+def build_ranking_results(scores: Dict[str, np.ndarray], weights: Dict[str, float]) -> List[Dict]:
+    """
+    Build ranking results from batch sub-score arrays
+    
+    Candidates share a small number of distinct sub-score combinations, so
+    each combination is built once; results with identical scores share
+    their (read-only) breakdown.
+    
+    Args:
+        scores: Score arrays from calculate_ats_scores_batch()
+        weights: Weights for the different factors
+    
+    Returns:
+        List of ranking results, in candidate order
+    """
+    built: Dict[tuple, Dict] = {}
+    results = []
+    for key in zip(
+        scores['skills'].tolist(),
+        scores['experience'].tolist(),
+        scores['location'].tolist(),
+        scores['education'].tolist()
+    ):
+        result = built.get(key)
+        if result is None:
+            result = built[key] = _build_ranking_result(*key, weights)
+        results.append(dict(result))
+    return results
+
+def calculate_ats_scores(job: Dict, features: Dict) -> Dict[str, float]:
+    """
+    Calculate the four ATS sub-scores for one prepared job and one candidate
+    
+    Scalar counterpart of calculate_ats_scores_batch(), for scoring one
+    candidate against many jobs.
+    
+    Args:
+        job: Prepared job from prepare_job()
+        features: Candidate features from extract_ats_features()
+    
+    Returns:
+        Dictionary of scores keyed by factor
+    """
+    if not job['skill_count']:
+        skills_score = 100.0
+    elif not features['skill_ids']:
+        skills_score = 0.0
+    else:
+        matched = len(frozenset(job['skill_ids']).intersection(features['skill_ids']))
+        skills_score = round((matched / job['skill_count']) * 100, 2)
+    
+    experience_score = calculate_experience_match(job['min_experience'], features['experience_years'])
+    
+    if not job['has_location']:
+        location_score = 100.0
+    elif features['willing_to_relocate']:
+        location_score = 100.0
+    elif not features['locations']:
+        location_score = 50.0
+    else:
+        best_match = max(_location_match_level(job['location'], location) for location in features['locations'])
+        location_score = {2: 100.0, 1: 85.0, 0: 30.0}[best_match]
+    
+    education_level = features['education_level']
+    required_level = job['education_level']
+    if not job['has_education']:
+        education_score = 100.0
+    elif education_level is None:
+        education_score = 60.0
+    elif required_level == 0:
+        education_score = 80.0
+    elif education_level >= required_level:
+        education_score = 100.0
+    elif education_level == required_level - 1:
+        education_score = 85.0
+    else:
+        education_score = max(50.0, (education_level / required_level) * 100)
+    
+    return {
+        'skills': skills_score,
+        'experience': experience_score,
+        'location': location_score,
+        'education': education_score
+    }
+
+def calculate_ats_ranking_batch(
+    job_data: Dict,
+    candidate_profiles: List[Dict],
+    weights: Optional[Dict[str, float]] = None
+) -> List[Dict]:
+    """
+    Calculate ATS rankings for many candidates against one job
+    
+    Produces exactly the same results as calling calculate_ats_ranking()
+    for each candidate, but normalizes the job once and scores all
+    candidates over NumPy arrays.
+    
+    Args:
+        job_data: Dictionary containing job requirements
+        candidate_profiles: Candidate profile dictionaries; a precomputed
+            `ats_features` field is used instead of the raw fields when present
+        weights: Optional custom weights for different factors
+    
+    Returns:
+        List of ranking results, in the same order as candidate_profiles
+    """
+    if weights is None:
+        weights = DEFAULT_WEIGHTS
+    
+    if not candidate_profiles:
+        return []
+    
+    job = prepare_job(job_data)
+    features = [
+        profile.get('ats_features') or extract_ats_features(profile)
+        for profile in candidate_profiles
+    ]
+    scores = calculate_ats_scores_batch(job, features)
+    
+    return build_ranking_results(scores, weights)
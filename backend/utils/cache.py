@@ -0,0 +1,83 @@
+"""
+In-process caching helpers
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+from collections import OrderedDict
+import asyncio
+import time
+
+class LRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry when full
+    
+    With a ttl (seconds), entries also expire that long after they were set.
+    """
+    
+    def __init__(self, max_size: int = 10000, ttl: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl = ttl
+        # key -> (value, expiry time or None)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return self._entry(key) is not None
+    
+    def _entry(self, key: Hashable) -> Optional[tuple]:
+        """Entry for a key, dropping it if it has expired"""
+        entry = self._data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+    
+    def get(self, key: Hashable, default: Optional[Any] = None) -> Any:
+        """Get a value and mark it as recently used"""
+        entry = self._entry(key)
+        if entry is None:
+            return default
+        self._data.move_to_end(key)
+        return entry[0]
+    
+    def set(self, key: Hashable, value: Any):
+        """Store a value, evicting the oldest entry if the cache is full"""
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+    
+    def delete(self, key: Hashable):
+        """Remove a value if present"""
+        self._data.pop(key, None)
+    
+    def clear(self):
+        """Remove all values"""
+        self._data.clear()
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one execution
+    
+    The first caller starts the work; callers arriving while it runs await
+    the same result (or exception) instead of repeating it.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+    
+    def __len__(self) -> int:
+        return len(self._calls)
+    
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() for key, or join the run already in flight"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        # Shielded so one caller going away doesn't cancel the others' result
+        return await asyncio.shield(task)
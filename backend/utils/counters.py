@@ -0,0 +1,88 @@
+"""
+Write-behind counters
+Aggregates counter increments (job views, applications) in memory and
+flushes them periodically with one bulk_write, so hot documents don't take
+a write per request
+"""
+
+from typing import Dict, Hashable
+from collections import defaultdict
+import logging
+import os
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from utils.periodic_flush import PeriodicFlusher
+
+logger = logging.getLogger(__name__)
+
+# Seconds between flushes of buffered increments
+COUNTER_FLUSH_INTERVAL = float(os.environ.get('COUNTER_FLUSH_INTERVAL', '5'))
+
+class CounterBuffer(PeriodicFlusher):
+    """
+    Buffered $inc updates for one collection
+    
+    Increments are summed per document and field, then written with one
+    unordered bulk_write per flush. Increments whose write failed stay
+    buffered for the next flush; those already applied are not retried.
+    Unflushed increments are lost if the process dies without running its
+    shutdown hooks.
+    """
+    
+    def __init__(self, collection: str, key_field: str = 'id', flush_interval: float = COUNTER_FLUSH_INTERVAL):
+        super().__init__(flush_interval)
+        self.collection = collection
+        self.key_field = key_field
+        self.pending: Dict[Hashable, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    
+    def increment(self, key: Hashable, field: str, amount: int = 1):
+        """Buffer an increment of a document's counter field"""
+        self.pending[key][field] += amount
+    
+    def pending_for(self, key: Hashable) -> Dict[str, int]:
+        """Increments buffered for a document but not yet flushed"""
+        return dict(self.pending.get(key, {}))
+    
+    async def flush(self, db) -> int:
+        """
+        Write all buffered increments
+        
+        Returns:
+            Number of documents updated
+        """
+        if not self.pending:
+            return 0
+        
+        pending, self.pending = self.pending, defaultdict(lambda: defaultdict(int))
+        keys = list(pending)
+        operations = [
+            UpdateOne({self.key_field: key}, {'$inc': dict(pending[key])})
+            for key in keys
+        ]
+        
+        try:
+            await db[self.collection].bulk_write(operations, ordered=False)
+        except BulkWriteError as e:
+            # The other operations of an unordered bulk write were applied;
+            # only the failed ones are kept for the next flush
+            failed = {error['index'] for error in e.details.get('writeErrors', [])}
+            logger.error(f"Failed to flush {len(failed)} {self.collection} counters: {str(e)}")
+            self._rebuffer({key: pending[key] for index, key in enumerate(keys) if index in failed})
+            return len(operations) - len(failed)
+        except Exception as e:
+            logger.error(f"Failed to flush {self.collection} counters: {str(e)}")
+            # Nothing was acknowledged; keep the increments for the next flush
+            self._rebuffer(pending)
+            return 0
+        
+        return len(operations)
+    
+    def _rebuffer(self, increments: Dict[Hashable, Dict[str, int]]):
+        for key, fields in increments.items():
+            for field, amount in fields.items():
+                self.pending[key][field] += amount
+
+# Shared per-process counters on jobs (views_count, applications_count)
+job_counters = CounterBuffer('jobs')
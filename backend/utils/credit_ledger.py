@@ -0,0 +1,163 @@
+"""
+Credit ledger
+Moves credits with one conditional find_one_and_update on the user (the
+balance guard and the paid-then-free split run inside MongoDB, so concurrent
+spends can't overdraw) and records the CreditTransactionExtended entry
+"""
+
+from typing import Dict, Optional
+
+from pymongo import ReturnDocument
+
+from models_credit_interview import CreditTransactionExtended, TransactionType, TransactionCategory
+
+# Stored balances may be missing on older users
+_FREE = {'$ifNull': ['$credits_free', 0]}
+_PAID = {'$ifNull': ['$credits_paid', 0]}
+
+BALANCE_PROJECTION = {'_id': 0, 'credits_free': 1, 'credits_paid': 1}
+
+class CreditAccountNotFoundError(Exception):
+    """The user whose credits are moved doesn't exist"""
+
+class InsufficientCreditsError(Exception):
+    """The user's total balance doesn't cover the deduction"""
+    
+    def __init__(self, required: int, available: int):
+        super().__init__(f'Insufficient credits. Required: {required}, Available: {available}')
+        self.required = required
+        self.available = available
+
+def _balance(user: Dict) -> Dict:
+    free, paid = user.get('credits_free', 0), user.get('credits_paid', 0)
+    return {'free': free, 'paid': paid, 'total': free + paid}
+
+async def _record_transaction(
+    db,
+    user_id: str,
+    amount: int,
+    balance: Dict,
+    transaction_type: TransactionType,
+    category: TransactionCategory,
+    description: str,
+    reference_id: Optional[str],
+    reference_type: Optional[str],
+    created_by: Optional[str]
+):
+    transaction = CreditTransactionExtended(
+        user_id=user_id,
+        amount=amount,
+        transaction_type=transaction_type,
+        category=category,
+        description=description,
+        reference_id=reference_id,
+        reference_type=reference_type,
+        balance_free=balance['free'],
+        balance_paid=balance['paid'],
+        created_by=created_by
+    )
+    await db.credit_transactions.insert_one(transaction.model_dump())
+
+async def deduct_credits(
+    db,
+    user_id: str,
+    amount: int,
+    transaction_type: TransactionType,
+    category: TransactionCategory,
+    description: str,
+    reference_id: Optional[str] = None,
+    reference_type: Optional[str] = None,
+    created_by: Optional[str] = None
+) -> Dict:
+    """
+    Deduct credits (paid first, then free) and record the transaction
+    
+    Args:
+        db: Database handle
+        user_id: User to charge
+        amount: Credits to deduct (positive)
+        transaction_type: Transaction type (SPEND, ADMIN_DEDUCT)
+        category: Transaction category
+        description: Transaction description
+        reference_id: ID of the record paid for (contact access, interview request, ...)
+        reference_type: Type of the referenced record
+        created_by: Admin user ID for manual adjustments
+    
+    Returns:
+        New balance with free, paid and total credits
+    
+    Raises:
+        InsufficientCreditsError: Free + paid credits don't cover the amount
+        CreditAccountNotFoundError: The user doesn't exist
+    """
+    # Paid credits cover as much as they can, free credits the rest
+    user = await db.users.find_one_and_update(
+        {'id': user_id, '$expr': {'$gte': [{'$add': [_FREE, _PAID]}, amount]}},
+        [{'$set': {
+            'credits_paid': {'$max': [0, {'$subtract': [_PAID, amount]}]},
+            'credits_free': {'$subtract': [_FREE, {'$max': [0, {'$subtract': [amount, _PAID]}]}]}
+        }}],
+        projection=BALANCE_PROJECTION,
+        return_document=ReturnDocument.AFTER
+    )
+    
+    if user is None:
+        # Only the failure path needs a second read, to tell the two cases apart
+        user = await db.users.find_one({'id': user_id}, BALANCE_PROJECTION)
+        if user is None:
+            raise CreditAccountNotFoundError(user_id)
+        raise InsufficientCreditsError(amount, _balance(user)['total'])
+    
+    balance = _balance(user)
+    await _record_transaction(
+        db, user_id, -amount, balance, transaction_type, category, description,
+        reference_id, reference_type, created_by
+    )
+    return balance
+
+async def add_credits(
+    db,
+    user_id: str,
+    amount: int,
+    transaction_type: TransactionType,
+    category: TransactionCategory,
+    description: str,
+    reference_id: Optional[str] = None,
+    reference_type: Optional[str] = None,
+    created_by: Optional[str] = None
+) -> Dict:
+    """
+    Add free credits and record the transaction
+    
+    Args:
+        db: Database handle
+        user_id: User to credit
+        amount: Credits to add (positive)
+        transaction_type: Transaction type (EARN, BONUS, ADMIN_ADD)
+        category: Transaction category
+        description: Transaction description
+        reference_id: ID of the record the credits are for
+        reference_type: Type of the referenced record
+        created_by: Admin user ID for manual adjustments
+    
+    Returns:
+        New balance with free, paid and total credits
+    
+    Raises:
+        CreditAccountNotFoundError: The user doesn't exist
+    """
+    user = await db.users.find_one_and_update(
+        {'id': user_id},
+        {'$inc': {'credits_free': amount}},
+        projection=BALANCE_PROJECTION,
+        return_document=ReturnDocument.AFTER
+    )
+    if user is None:
+        raise CreditAccountNotFoundError(user_id)
+    
+    balance = _balance(user)
+    await _record_transaction(
+        db, user_id, amount, balance, transaction_type, category, description,
+        reference_id, reference_type, created_by
+    )
+    return balance
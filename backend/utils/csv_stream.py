@@ -0,0 +1,54 @@
+"""
+Streaming CSV export
+Turns a database cursor into CSV chunks pulled a batch at a time, so an
+export's memory stays flat whatever the number of rows
+"""
+
+from typing import AsyncIterator, Callable, Dict, List
+import csv
+import io
+import os
+
+# Rows fetched from the cursor and written per CSV chunk
+CSV_EXPORT_BATCH_SIZE = int(os.environ.get('CSV_EXPORT_BATCH_SIZE', '500'))
+
+async def stream_csv(
+    cursor,
+    header: List[str],
+    to_row: Callable[[Dict], List],
+    batch_size: int = CSV_EXPORT_BATCH_SIZE
+) -> AsyncIterator[str]:
+    """
+    Yield a CSV export chunk by chunk
+    
+    Args:
+        cursor: Motor cursor over the exported documents
+        header: Header row
+        to_row: Converts a document into a CSV row
+        batch_size: Documents per cursor batch and per yielded chunk
+    
+    Yields:
+        CSV text: the header first, then one chunk per batch
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+    
+    def drain() -> str:
+        chunk = output.getvalue()
+        output.seek(0)
+        output.truncate()
+        return chunk
+    
+    writer.writerow(header)
+    yield drain()
+    
+    rows = 0
+    async for document in cursor.batch_size(batch_size):
+        writer.writerow(to_row(document))
+        rows += 1
+        if rows == batch_size:
+            yield drain()
+            rows = 0
+    
+    if rows:
+        yield drain()
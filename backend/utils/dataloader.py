@@ -0,0 +1,101 @@
+"""
+Request-scoped batched document loaders
+Collects the by-key lookups a request makes in the same event loop tick and
+resolves them with one `$in` query per collection, memoizing results for
+the rest of the request. Replaces find_one calls inside loops (N+1 queries).
+"""
+
+from typing import Dict, Hashable, Iterable, List, Optional
+import asyncio
+
+# Keys per $in query
+DATALOADER_MAX_BATCH = 1000
+
+class DataLoader:
+    """
+    Batched, memoized lookups of documents by one key field
+    
+    `await loader.load(key)` queues the key and waits; every key queued
+    before the event loop gets to the dispatch is fetched with one query.
+    Lookups made concurrently (asyncio.gather, load_many) therefore share
+    a query, and repeated keys are served from the request's memo.
+    Missing documents resolve to None.
+    """
+    
+    def __init__(self, collection, key_field: str = 'id', projection: Optional[Dict] = None):
+        self.collection = collection
+        self.key_field = key_field
+        self.projection = {'_id': 0, **(projection or {})}
+        self._memo: Dict[Hashable, asyncio.Future] = {}
+        self._queue: List[Hashable] = []
+        self._dispatch_scheduled = False
+        self._dispatch_task: Optional[asyncio.Task] = None
+    
+    def _enqueue(self, key: Hashable) -> asyncio.Future:
+        future = self._memo.get(key)
+        if future is not None:
+            return future
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._memo[key] = future
+        self._queue.append(key)
+        if not self._dispatch_scheduled:
+            self._dispatch_scheduled = True
+            loop.call_soon(self._start_dispatch)
+        return future
+    
+    def _start_dispatch(self):
+        # Keep a reference so the task isn't garbage collected mid-query
+        self._dispatch_task = asyncio.ensure_future(self._dispatch())
+    
+    async def _dispatch(self):
+        keys, self._queue = self._queue, []
+        self._dispatch_scheduled = False
+        
+        for start in range(0, len(keys), DATALOADER_MAX_BATCH):
+            batch = keys[start:start + DATALOADER_MAX_BATCH]
+            try:
+                documents = await self.collection.find(
+                    {self.key_field: {'$in': batch}},
+                    self.projection
+                ).to_list(None)
+            except Exception as e:
+                for key in batch:
+                    # Forget the failure so a later load can retry
+                    future = self._memo.pop(key)
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            found = {document[self.key_field]: document for document in documents}
+            for key in batch:
+                future = self._memo[key]
+                if not future.done():
+                    future.set_result(found.get(key))
+    
+    async def load(self, key: Hashable) -> Optional[Dict]:
+        """Document with this key (None if there is none)"""
+        return await self._enqueue(key)
+    
+    async def load_many(self, keys: Iterable[Hashable]) -> List[Optional[Dict]]:
+        """Documents for several keys, in key order (one query for all uncached keys)"""
+        return list(await asyncio.gather(*[self._enqueue(key) for key in keys]))
+    
+    def prime(self, key: Hashable, document: Optional[Dict]):
+        """Seed the memo with an already loaded document"""
+        if key not in self._memo:
+            future = asyncio.get_running_loop().create_future()
+            future.set_result(document)
+            self._memo[key] = future
+
+class RequestLoaders:
+    """
+    Loaders for one request; create a new instance per request so memoized
+    documents never outlive it
+    """
+    
+    def __init__(self, db):
+        self.users = DataLoader(db.users, 'id', {'password_hash': 0, 'magic_link_token': 0})
+        self.jobs = DataLoader(db.jobs, 'id')
+        self.jobseeker_profiles = DataLoader(db.jobseeker_profiles, 'user_id', {'ats_features': 0})
@@ -0,0 +1,236 @@
+"""
+Declarative MongoDB index registry
+Every index the application relies on is declared here, created on startup
+and compared with what exists in the database for dry-run reports
+"""
+
+from typing import List, Dict, Optional, Set, Tuple
+import logging
+
+from pymongo import ASCENDING, DESCENDING, TEXT
+
+from utils.job_search import JOB_TEXT_INDEX_NAME, JOB_TEXT_INDEX_WEIGHTS
+from utils.ats_cache import ATS_CACHE_STORE_TTL
+
+logger = logging.getLogger(__name__)
+
+# Options compared between declared and existing indexes
+COMPARED_OPTIONS = ['unique', 'sparse', 'expireAfterSeconds', 'partialFilterExpression']
+
+# One application per job seeker and job (apply_for_job relies on it)
+JOB_APPLICATION_UNIQUE_KEYS = [('job_id', ASCENDING), ('job_seeker_id', ASCENDING)]
+
+def index(keys: List[Tuple[str, object]], name: Optional[str] = None, **options) -> Dict:
+    """
+    Declare an index
+    
+    Args:
+        keys: List of (field, direction) pairs
+        name: Index name (defaults to MongoDB's own naming, e.g. "user_id_1_created_at_-1")
+        **options: create_index options (unique, expireAfterSeconds, partialFilterExpression, ...)
+    """
+    return {
+        'keys': keys,
+        'name': name or '_'.join(f"{field}_{direction}" for field, direction in keys),
+        'options': options
+    }
+
+def _string_only(field: str) -> Dict:
+    """Partial filter indexing only string values, so documents without the field don't collide"""
+    return {field: {'$type': 'string'}}
+
+INDEX_REGISTRY: Dict[str, List[Dict]] = {
+    'users': [
+        index([('id', ASCENDING)], unique=True),
+        index([('email', ASCENDING)], unique=True),
+        index([('phone', ASCENDING)], unique=True, partialFilterExpression=_string_only('phone')),
+        index([('magic_link_token', ASCENDING)], partialFilterExpression=_string_only('magic_link_token')),
+        index([('role', ASCENDING)]),
+    ],
+    'jobs': [
+        index([('id', ASCENDING)], unique=True),
+        index([('employer_id', ASCENDING), ('created_at', DESCENDING)]),
+        # Job search sorts (keyset: sort field, then id)
+        index([('status', ASCENDING), ('created_at', DESCENDING), ('id', DESCENDING)]),
+        index([('status', ASCENDING), ('min_salary', DESCENDING), ('id', DESCENDING)]),
+        index([('required_skill_ids', ASCENDING)]),
+        index([('required_skills', ASCENDING)]),
+        index(
+            [(field, TEXT) for field in JOB_TEXT_INDEX_WEIGHTS],
+            name=JOB_TEXT_INDEX_NAME,
+            weights=JOB_TEXT_INDEX_WEIGHTS,
+            default_language='english'
+        ),
+    ],
+    'job_applications': [
+        index([('id', ASCENDING)], unique=True),
+        index(JOB_APPLICATION_UNIQUE_KEYS, unique=True),
+        # Applicant inbox sorts (keyset: sort field, then id)
+        index([('job_id', ASCENDING), ('applied_at', DESCENDING), ('id', DESCENDING)]),
+        index([('job_id', ASCENDING), ('ats_score', DESCENDING), ('id', DESCENDING)]),
+        index([('job_seeker_id', ASCENDING), ('applied_at', DESCENDING)]),
+    ],
+    'jobseeker_profiles': [
+        index([('user_id', ASCENDING)], unique=True),
+        index([('primary_skills', ASCENDING)]),
+        # Talent search sorts
+        index([('overall_rating', DESCENDING), ('verification_count', DESCENDING)]),
+        index([('experience_years', DESCENDING)]),
+        index([('updated_at', DESCENDING)]),
+    ],
+    'employer_profiles': [
+        index([('user_id', ASCENDING)], unique=True),
+    ],
+    'interviewer_profiles': [
+        index([('user_id', ASCENDING)], unique=True),
+    ],
+    'credit_transactions': [
+        index([('user_id', ASCENDING), ('created_at', DESCENDING)]),
+        # Admin listing; with the ID also the Parquet export's keyset order
+        index([('created_at', DESCENDING), ('id', DESCENDING)]),
+    ],
+    'contact_access': [
+        index([('employer_id', ASCENDING), ('jobseeker_id', ASCENDING), ('is_active', ASCENDING)]),
+        index([('employer_id', ASCENDING), ('access_granted_at', DESCENDING)]),
+        index([('access_granted_at', DESCENDING), ('id', DESCENDING)]),
+    ],
+    'interview_requests': [
+        index([('id', ASCENDING)], unique=True),
+        index([('jobseeker_id', ASCENDING), ('created_at', DESCENDING)]),
+        index([('interviewer_id', ASCENDING), ('created_at', DESCENDING)]),
+        index([('status', ASCENDING), ('created_at', DESCENDING)]),
+        index([('notified_interviewers', ASCENDING)]),
+    ],
+    'interview_ratings': [
+        index([('created_at', DESCENDING), ('id', DESCENDING)]),
+    ],
+    'login_history': [
+        index([('user_id', ASCENDING), ('login_time', DESCENDING)]),
+        index([('session_id', ASCENDING), ('user_id', ASCENDING)]),
+        index([('login_time', DESCENDING), ('history_id', DESCENDING)]),
+    ],
+    'user_sessions': [
+        index([('session_id', ASCENDING)], unique=True),
+        index([('user_id', ASCENDING), ('is_active', ASCENDING), ('expires_at', ASCENDING)]),
+        # Expired sessions are removed by MongoDB
+        index([('expires_at', ASCENDING)], expireAfterSeconds=0),
+    ],
+    'ats_score_cache': [
+        index([('job_id', ASCENDING), ('candidate_id', ASCENDING)], unique=True),
+        # Scores of inactive pairs are removed by MongoDB
+        index([('updated_at', ASCENDING)], expireAfterSeconds=ATS_CACHE_STORE_TTL),
+    ],
+    'job_rankings': [
+        index([('job_id', ASCENDING), ('candidate_id', ASCENDING)], unique=True),
+        index([('job_id', ASCENDING), ('overall_score', DESCENDING), ('candidate_id', DESCENDING)]),
+        index([('candidate_id', ASCENDING)]),
+    ],
+    'skill_dictionary': [
+        index([('name', ASCENDING)], unique=True),
+        index([('skill_id', ASCENDING)], unique=True),
+    ],
+}
+
+def _key_pattern(keys: List[Tuple[str, object]]) -> Tuple:
+    """Comparable key pattern; MongoDB reports text indexes as (_fts, _ftsx) whatever their fields"""
+    if any(direction == TEXT for _, direction in keys):
+        return (('_fts', 'text'), ('_ftsx', 1))
+    return tuple((field, direction) for field, direction in keys)
+
+def _options_differ(declared: Dict, existing: Dict) -> List[str]:
+    """Compared options whose declared and existing values differ"""
+    differing = []
+    for option in COMPARED_OPTIONS:
+        declared_value, existing_value = declared['options'].get(option), existing.get(option)
+        if option in ('unique', 'sparse'):
+            declared_value, existing_value = bool(declared_value), bool(existing_value)
+        if declared_value != existing_value:
+            differing.append(option)
+    return differing
+
+async def ensure_indexes(db, dry_run: bool = False, collections: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Compare declared indexes with the database and create the missing ones
+    
+    Existing indexes whose options differ from the declaration are reported
+    as conflicts and left alone (fixing them means dropping the index first).
+    
+    Args:
+        db: Database handle
+        dry_run: Only report, don't create anything
+        collections: Restrict to these collections (default: whole registry)
+    
+    Returns:
+        Report entries with collection, name, keys and status
+        (ok, missing, created, failed, conflict or extra)
+    """
+    report = []
+    for collection, declared_indexes in INDEX_REGISTRY.items():
+        if collections is not None and collection not in collections:
+            continue
+        
+        existing = await db[collection].index_information()
+        existing_by_keys = {
+            tuple((field, direction) for field, direction in info['key']): (name, info)
+            for name, info in existing.items()
+        }
+        
+        matched_names = {'_id_'}
+        for declared in declared_indexes:
+            entry = {'collection': collection, 'name': declared['name'], 'keys': declared['keys']}
+            found = (
+                existing_by_keys.get(_key_pattern(declared['keys'])) or
+                existing_by_keys.get(tuple((field, direction) for field, direction in declared['keys']))
+            )
+            
+            if found is not None:
+                name, info = found
+                matched_names.add(name)
+                differing = _options_differ(declared, info)
+                if differing:
+                    entry.update(status='conflict', existing_name=name, differing_options=differing)
+                else:
+                    entry['status'] = 'ok'
+            elif dry_run:
+                entry['status'] = 'missing'
+            else:
+                try:
+                    await db[collection].create_index(declared['keys'], name=declared['name'], **declared['options'])
+                    entry['status'] = 'created'
+                except Exception as e:
+                    logger.error(f"Failed to create index {collection}.{declared['name']}: {str(e)}")
+                    entry.update(status='failed', error=str(e))
+            
+            report.append(entry)
+        
+        for name, info in existing.items():
+            if name not in matched_names:
+                report.append({'collection': collection, 'name': name, 'keys': info['key'], 'status': 'extra'})
+    
+    counts: Dict[str, int] = {}
+    for entry in report:
+        counts[entry['status']] = counts.get(entry['status'], 0) + 1
+    logger.info(f"Index check{' (dry run)' if dry_run else ''}: {counts}")
+    
+    return report
+
+# (database, collection, key pattern, unique) of indexes seen to exist
+_confirmed_indexes: Set[Tuple] = set()
+
+async def index_exists(db, collection: str, keys: List[Tuple[str, object]], unique: bool = False) -> bool:
+    """
+    Check whether an index on these keys exists (and is unique, if asked)
+    
+    Only positive answers are cached, so an index built after startup
+    (e.g. once blocking duplicates were removed) is picked up on the next call.
+    """
+    cache_key = (db.name, collection, tuple(keys), unique)
+    if cache_key in _confirmed_indexes:
+        return True
+    
+    existing = await db[collection].index_information()
+    for info in existing.values():
+        if tuple((field, direction) for field, direction in info['key']) == tuple(keys) and (info.get('unique') or not unique):
+            _confirmed_indexes.add(cache_key)
+            return True
+    return False
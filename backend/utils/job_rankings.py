@@ -0,0 +1,240 @@
+"""
+Materialized per-job ATS rankings
+Keeps one `job_rankings` document per (job, applicant) with the applicant's
+current ranking result, updated incrementally on applications, profile
+changes and (in the background) job requirement changes, so employers
+page through a sorted, indexed ranking instead of rescoring every
+applicant per request. The overall score is mirrored onto the
+application as `ats_score` for the applicant inbox
+"""
+
+from typing import List, Dict, Optional, Set, Tuple
+from datetime import datetime
+import logging
+import os
+
+from pymongo import UpdateOne
+
+from utils.ats_features import load_ats_candidates
+from utils.ats_index import JOB_ATS_PROJECTION
+from utils.ats_parallel import rank_candidates
+from utils.ats_ranking import (
+    DEFAULT_WEIGHTS,
+    prepare_job,
+    calculate_ats_scores,
+    _build_ranking_result
+)
+from utils.skill_dictionary import skill_dictionary
+from utils.pagination import keyset_sort, keyset_filter
+from utils.periodic_flush import PeriodicFlusher
+
+logger = logging.getLogger(__name__)
+
+# Job fields the ranking depends on; changing any of them rescores the job's applicants
+JOB_REQUIREMENT_FIELDS = ['required_skills', 'min_experience', 'location', 'education_required']
+
+# Sort order of a job's ranking (keyset: ties broken by candidate ID so pages are stable)
+JOB_RANKING_SORT = keyset_sort('overall_score', -1, 'candidate_id')
+
+# Seconds between background rescoring passes for jobs whose requirements changed
+RANKING_REFRESH_INTERVAL = float(os.environ.get('RANKING_REFRESH_INTERVAL', '5'))
+
+# (job ID, candidate ID, ranking result)
+RankingEntry = Tuple[str, str, Dict]
+
+def build_ranking_query(job_id: str, cursor: Optional[str] = None) -> Dict:
+    """
+    Filter for a page of a job's ranking, read in JOB_RANKING_SORT order
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    query = {'job_id': job_id}
+    if cursor:
+        query = {'$and': [query, keyset_filter('overall_score', -1, cursor, 'candidate_id')]}
+    return query
+
+def _ranking_update(job_id: str, candidate_id: str, result: Dict, now: datetime) -> UpdateOne:
+    return UpdateOne(
+        {'job_id': job_id, 'candidate_id': candidate_id},
+        {'$set': {
+            'overall_score': result['overall_score'],
+            'ranking': result['ranking'],
+            'category': result['category'],
+            'breakdown': result['breakdown'],
+            'updated_at': now
+        }},
+        upsert=True
+    )
+
+def _application_score_update(job_id: str, candidate_id: str, result: Dict) -> UpdateOne:
+    return UpdateOne(
+        {'job_id': job_id, 'job_seeker_id': candidate_id},
+        {'$set': {'ats_score': result['overall_score']}}
+    )
+
+async def _write_rankings(db, entries: List[RankingEntry], mirror_scores: bool = True) -> int:
+    if not entries:
+        return 0
+    now = datetime.utcnow()
+    try:
+        await db.job_rankings.bulk_write(
+            [_ranking_update(job_id, candidate_id, result, now) for job_id, candidate_id, result in entries],
+            ordered=False
+        )
+        if mirror_scores:
+            await db.job_applications.bulk_write(
+                [_application_score_update(job_id, candidate_id, result) for job_id, candidate_id, result in entries],
+                ordered=False
+            )
+    except Exception as e:
+        logger.error(f"Failed to write job rankings: {str(e)}")
+        return 0
+    return len(entries)
+
+def score_candidate(job: Dict, features: Dict) -> Dict:
+    """Ranking result of one candidate's ats_features against a job (skills must be interned)"""
+    scores = calculate_ats_scores(prepare_job(job), features)
+    return _build_ranking_result(
+        scores['skills'], scores['experience'], scores['location'], scores['education'], DEFAULT_WEIGHTS
+    )
+
+async def add_ranking_entry(db, job_id: str, candidate_id: str, result: Dict) -> int:
+    """
+    Upsert one applicant's ranking entry from an already computed result
+    
+    The application's ats_score isn't touched; a new application is
+    inserted with it.
+    """
+    return await _write_rankings(db, [(job_id, candidate_id, result)], mirror_scores=False)
+
+async def update_job_rankings(db, job: Dict, candidate_ids: Optional[List[str]] = None) -> int:
+    """
+    Score applicants against a job and upsert their ranking entries
+    
+    Args:
+        db: Database handle
+        job: Job document
+        candidate_ids: Applicants to (re)score; all of the job's applicants if None
+    
+    Returns:
+        Number of ranking entries written
+    """
+    if candidate_ids is None:
+        applications = await db.job_applications.find({'job_id': job['id']}, {'_id': 0, 'job_seeker_id': 1}).to_list(None)
+        candidate_ids = [application['job_seeker_id'] for application in applications]
+    
+    if not candidate_ids:
+        return 0
+    
+    await skill_dictionary.intern(db, job.get('required_skills') or [])
+    candidates = await load_ats_candidates(db, {'user_id': {'$in': candidate_ids}})
+    results = await rank_candidates(job, candidates)
+    
+    return await _write_rankings(db, [
+        (job['id'], candidate['user_id'], result)
+        for candidate, result in zip(candidates, results)
+    ])
+
+async def refresh_candidate_rankings(db, user_id: str, features: Dict) -> int:
+    """
+    Rescore a job seeker in the ranking of every job they applied to
+    
+    Args:
+        db: Database handle
+        user_id: Job seeker user ID
+        features: The job seeker's current ats_features
+    
+    Returns:
+        Number of ranking entries written
+    """
+    applications = await db.job_applications.find({'job_seeker_id': user_id}, {'_id': 0, 'job_id': 1}).to_list(None)
+    if not applications:
+        return 0
+    
+    jobs = await db.jobs.find(
+        {'id': {'$in': [application['job_id'] for application in applications]}},
+        JOB_ATS_PROJECTION
+    ).to_list(None)
+    await skill_dictionary.intern(db, [skill for job in jobs for skill in job.get('required_skills') or []])
+    
+    return await _write_rankings(db, [(job['id'], user_id, score_candidate(job, features)) for job in jobs])
+
+async def delete_job_rankings(db, job_id: str):
+    """Drop a job's ranking (the job was deleted)"""
+    await db.job_rankings.delete_many({'job_id': job_id})
+
+async def rebuild_job_ranking(db, job: Dict) -> int:
+    """
+    Regenerate a job's ranking and drop entries of withdrawn applicants
+    
+    Fresh entries are upserted before stale ones are deleted, so the
+    ranking stays readable while it's rebuilt.
+    """
+    applications = await db.job_applications.find({'job_id': job['id']}, {'_id': 0, 'job_seeker_id': 1}).to_list(None)
+    candidate_ids = [application['job_seeker_id'] for application in applications]
+    
+    entries = await update_job_rankings(db, job, candidate_ids)
+    await db.job_rankings.delete_many({'job_id': job['id'], 'candidate_id': {'$nin': candidate_ids}})
+    return entries
+
+async def rebuild_all_rankings(db) -> Tuple[int, int]:
+    """
+    Regenerate every job's ranking from scratch
+    
+    Returns:
+        Tuple of (jobs ranked, ranking entries written)
+    """
+    job_ids = await db.job_applications.distinct('job_id')
+    jobs = await db.jobs.find({'id': {'$in': job_ids}}, {'_id': 0}).to_list(None)
+    
+    # Rankings of jobs that no longer exist or have no applicants
+    await db.job_rankings.delete_many({'job_id': {'$nin': [job['id'] for job in jobs]}})
+    
+    entries = 0
+    for job in jobs:
+        entries += await rebuild_job_ranking(db, job)
+    return len(jobs), entries
+
+class RankingRefresher(PeriodicFlusher):
+    """
+    Background rescoring of jobs whose requirements changed
+    
+    Rescoring every applicant of a big job is too slow for the request that
+    edited it, so the job is queued and its ranking rebuilt on the next
+    flush, from the job as stored then (several edits cost one rescore).
+    A job whose rescore fails stays queued for the next flush.
+    """
+    
+    def __init__(self, flush_interval: float = RANKING_REFRESH_INTERVAL):
+        super().__init__(flush_interval)
+        self.pending: Set[str] = set()
+    
+    def job_changed(self, job_id: str):
+        """Queue a job's ranking for rescoring"""
+        self.pending.add(job_id)
+    
+    async def flush(self, db) -> int:
+        """
+        Rescore every queued job
+        
+        Returns:
+            Number of ranking entries written
+        """
+        if not self.pending:
+            return 0
+        
+        pending, self.pending = self.pending, set()
+        entries = 0
+        for job_id in pending:
+            try:
+                job = await db.jobs.find_one({'id': job_id}, {'_id': 0})
+                if job:
+                    entries += await update_job_rankings(db, job)
+            except Exception as e:
+                logger.error(f"Failed to rescore ranking of job {job_id}: {str(e)}")
+                self.pending.add(job_id)
+        return entries
+
+# Shared per-process refresher
+job_ranking_refresher = RankingRefresher()
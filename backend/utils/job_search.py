@@ -0,0 +1,140 @@
+"""
+Full-text job search
+Weighted text index over job title, required skills and description
+(English stemming), with a regex fallback for exact phrases, plus the
+$facet stages for result totals and filter counts
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Tuple
+import os
+import re
+
+from utils.cache import LRUCache, SingleFlight
+
+# Facet dimensions returned with search results, with the number of values kept (None = all)
+JOB_FACET_FIELDS = {
+    'job_type': None,
+    'work_mode': None,
+    'location': 20
+}
+
+# Totals and facet counts per filter combination are reused for this many seconds
+JOB_FACET_CACHE_TTL = float(os.environ.get('JOB_FACET_CACHE_TTL', '30'))
+JOB_FACET_CACHE_SIZE = int(os.environ.get('JOB_FACET_CACHE_SIZE', '1000'))
+
+# Whole search responses are reused for this many seconds, or until a job write
+JOB_SEARCH_CACHE_TTL = float(os.environ.get('JOB_SEARCH_CACHE_TTL', '15'))
+JOB_SEARCH_CACHE_SIZE = int(os.environ.get('JOB_SEARCH_CACHE_SIZE', '1000'))
+
+# Weighted text index (declared in utils/indexes.py); relative weight of a
+# term match in each field (title > skills > description)
+JOB_TEXT_INDEX_NAME = 'jobs_text'
+JOB_TEXT_INDEX_WEIGHTS = {
+    'job_title': 10,
+    'required_skills': 5,
+    'description': 1
+}
+
+def build_text_search(query: str, search_mode: str = 'text') -> Tuple[Dict, bool]:
+    """
+    Build the filter for a job search query
+    
+    Queries wrapped in double quotes are exact phrases and, like
+    search_mode='regex', are matched with a case-insensitive regex on the
+    title and description instead of the stemmed text index.
+    
+    Args:
+        query: Search terms
+        search_mode: 'text' (indexed, stemmed) or 'regex'
+    
+    Returns:
+        Tuple of (filter fragment, whether results have a text relevance score)
+    """
+    stripped = query.strip()
+    is_phrase = len(stripped) > 1 and stripped.startswith('"') and stripped.endswith('"')
+    
+    if search_mode == 'regex' or is_phrase:
+        pattern = re.escape(stripped[1:-1]) if is_phrase else query
+        return {'$or': [
+            {'job_title': {'$regex': pattern, '$options': 'i'}},
+            {'description': {'$regex': pattern, '$options': 'i'}},
+        ]}, False
+    
+    return {'$text': {'$search': query}}, True
+
+def build_summary_facets() -> Dict[str, List[Dict]]:
+    """$facet sub-pipelines for the result total and the count per value of each facet field"""
+    facets = {'total': [{'$count': 'count'}]}
+    for field, max_values in JOB_FACET_FIELDS.items():
+        stages = [
+            {'$group': {'_id': f'${field}', 'count': {'$sum': 1}}},
+            {'$sort': {'count': -1, '_id': 1}}
+        ]
+        if max_values:
+            stages.append({'$limit': max_values})
+        facets[field] = stages
+    return facets
+
+def parse_summary_facets(outcome: Dict) -> Dict:
+    """
+    Read the output of build_summary_facets() sub-pipelines
+    
+    Returns:
+        Dictionary with the total and, per facet field, a list of {value, count}
+    """
+    total = outcome['total'][0]['count'] if outcome['total'] else 0
+    return {
+        'total': total,
+        'facets': {
+            field: [{'value': entry['_id'], 'count': entry['count']} for entry in outcome[field]]
+            for field in JOB_FACET_FIELDS
+        }
+    }
+
+# Shared per-process cache of {total, facets} per search filter
+job_facet_cache = LRUCache(JOB_FACET_CACHE_SIZE, ttl=JOB_FACET_CACHE_TTL)
+
+class JobSearchCache:
+    """
+    TTL + LRU cache of search responses keyed by the normalized search parameters
+    
+    Concurrent misses for the same key run one query (single flight). Job
+    writes in this process call invalidate(); writes in other processes are
+    picked up when entries expire.
+    """
+    
+    def __init__(self, max_size: int = JOB_SEARCH_CACHE_SIZE, ttl: float = JOB_SEARCH_CACHE_TTL):
+        self.results = LRUCache(max_size, ttl=ttl)
+        self.flight = SingleFlight()
+        # Bumped on invalidation, so searches started before a write don't store their results
+        self.generation = 0
+    
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Cached response for key, computing it (once per burst of misses) if needed
+        
+        Returns:
+            Tuple of (response, whether it came from the cache)
+        """
+        cached = self.results.get(key)
+        if cached is not None:
+            return cached, True
+        
+        generation = self.generation
+        
+        async def run():
+            response = await compute()
+            if self.generation == generation:
+                self.results.set(key, response)
+            return response
+        
+        return await self.flight.do((generation, key), run), False
+    
+    def invalidate(self):
+        """Drop every cached search (a job was created, updated or deleted)"""
+        self.generation += 1
+        self.results.clear()
+        job_facet_cache.clear()
+
+# Shared per-process cache of search responses
+job_search_cache = JobSearchCache()
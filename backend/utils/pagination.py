@@ -0,0 +1,107 @@
+"""
+Keyset (cursor) pagination
+Opaque cursor tokens encode the sort value and ID of the last item seen, so
+the next page continues from there instead of skipping over earlier pages
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+from datetime import datetime
+import base64
+import json
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'$date': value.isoformat()}
+    return value
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and '$date' in value:
+        return datetime.fromisoformat(value['$date'])
+    return value
+
+def encode_cursor(sort_value: Any, item_id: str) -> str:
+    """
+    Build an opaque cursor for the item a page ended on
+    
+    Args:
+        sort_value: Value of the sort field on the last item (may be None)
+        item_id: ID of the last item (tie-breaker)
+    
+    Returns:
+        URL-safe cursor token
+    """
+    payload = json.dumps([_encode_value(sort_value), item_id], separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """
+    Decode a cursor from encode_cursor()
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        sort_value, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return _decode_value(sort_value), str(item_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+def keyset_sort(sort_field: str, direction: int, id_field: str = 'id') -> List[Tuple[str, int]]:
+    """Sort spec with the ID as tie-breaker, so every item has a unique position"""
+    return [(sort_field, direction), (id_field, direction)]
+
+def keyset_filter(
+    sort_field: str,
+    direction: int,
+    cursor: str,
+    id_field: str = 'id'
+) -> Dict:
+    """
+    Filter matching the items after a cursor in keyset_sort() order
+    
+    Null (or missing) sort values sort before every other value, i.e. last
+    when descending and first when ascending.
+    
+    Args:
+        sort_field: Field the results are sorted on
+        direction: 1 (ascending) or -1 (descending)
+        cursor: Cursor from encode_cursor()
+        id_field: Unique tie-breaker field
+    
+    Returns:
+        Filter to combine (with $and) with the query's own filter
+    
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    sort_value, item_id = decode_cursor(cursor)
+    after = '$gt' if direction > 0 else '$lt'
+    
+    if sort_value is None:
+        same_value = {sort_field: None, id_field: {after: item_id}}
+        if direction > 0:
+            return {'$or': [same_value, {sort_field: {'$ne': None}}]}
+        return same_value
+    
+    conditions = [
+        {sort_field: {after: sort_value}},
+        {sort_field: sort_value, id_field: {after: item_id}}
+    ]
+    if direction < 0:
+        conditions.append({sort_field: None})
+    return {'$or': conditions}
+
+def next_cursor(items: List[Dict], limit: int, sort_field: str, id_field: str = 'id') -> Optional[str]:
+    """
+    Cursor for the page after items, fetched with limit + 1
+    
+    Drops the extra look-ahead item from items in place.
+    
+    Returns:
+        Cursor token, or None if this is the last page
+    """
+    if len(items) <= limit:
+        return None
+    del items[limit:]
+    last = items[-1]
+    return encode_cursor(last.get(sort_field), last[id_field])
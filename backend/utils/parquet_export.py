@@ -0,0 +1,179 @@
+"""
+Incremental Parquet export of ledger and activity collections
+Streams new documents from MongoDB in batches (after a per-collection
+high-water mark kept in `export_state`) and writes them as date-partitioned
+Parquet files for finance and analytics:
+
+    <EXPORT_DIR>/<collection>/date=YYYY-MM-DD/part-<run>-<batch>.parquet
+"""
+
+from typing import List, Dict, Optional
+from datetime import datetime, timedelta
+from pathlib import Path
+import asyncio
+import importlib.util
+import json
+import logging
+import os
+
+import pandas as pd
+
+from utils.pagination import encode_cursor, keyset_sort, keyset_filter
+
+logger = logging.getLogger(__name__)
+
+# Exported collections: (timestamp field the export advances on, unique ID field)
+EXPORT_SOURCES = {
+    'credit_transactions': ('created_at', 'id'),
+    'contact_access': ('access_granted_at', 'id'),
+    'interview_ratings': ('created_at', 'id'),
+    'login_history': ('login_time', 'history_id'),
+}
+
+EXPORT_DIR = Path(os.environ.get('EXPORT_DIR', str(Path(__file__).parent.parent / 'exports')))
+
+# Documents per cursor batch (and at most per Parquet file)
+EXPORT_BATCH_SIZE = int(os.environ.get('EXPORT_BATCH_SIZE', '5000'))
+
+# Rows younger than this are left for the next run, so documents written
+# with a slightly older timestamp don't slip behind the high-water mark
+EXPORT_SETTLE_SECONDS = int(os.environ.get('EXPORT_SETTLE_SECONDS', '60'))
+
+# Parquet is written through pandas with pyarrow as the engine
+PARQUET_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+# Held while an export runs in this process (concurrent runs would write the same rows twice)
+export_lock = asyncio.Lock()
+
+def _is_missing(value) -> bool:
+    return value is None or (isinstance(value, float) and value != value)
+
+def _to_frame(documents: List[Dict]) -> pd.DataFrame:
+    """
+    Flatten documents into a Parquet-friendly frame
+    
+    Embedded documents become dotted columns; lists (e.g. skill ratings) and
+    columns mixing value types across documents (legacy string timestamps)
+    are stored as JSON/strings.
+    """
+    frame = pd.json_normalize(documents, sep='.')
+    for column in frame.columns:
+        values = [value for value in frame[column] if not _is_missing(value)]
+        if not values:
+            continue
+        if any(isinstance(value, (list, dict)) for value in values):
+            frame[column] = [None if _is_missing(value) else json.dumps(value, default=str) for value in frame[column]]
+        elif frame[column].dtype == object and len({type(value) for value in values}) > 1:
+            frame[column] = [None if _is_missing(value) else str(value) for value in frame[column]]
+    return frame
+
+def _write_partitions(documents: List[Dict], collection: str, time_field: str, export_dir: Path, file_stem: str) -> List[str]:
+    """Write one batch as one Parquet file per date partition; returns the written paths"""
+    frame = _to_frame(documents)
+    dates = pd.to_datetime(frame[time_field]).dt.strftime('%Y-%m-%d')
+    
+    paths = []
+    for date, partition in frame.groupby(dates, sort=True):
+        directory = export_dir / collection / f'date={date}'
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f'{file_stem}.parquet'
+        partition.to_parquet(path, index=False, engine='pyarrow')
+        paths.append(str(path))
+    return paths
+
+async def export_collection(
+    db,
+    collection: str,
+    export_dir: Optional[Path] = None,
+    batch_size: int = EXPORT_BATCH_SIZE
+) -> Dict:
+    """
+    Export a collection's documents added since its last export
+    
+    The high-water mark (last exported timestamp and ID) is advanced after
+    every written batch, so an interrupted export resumes where it stopped.
+    
+    Args:
+        db: Database handle
+        collection: One of EXPORT_SOURCES
+        export_dir: Root export directory (default: EXPORT_DIR)
+        batch_size: Documents per cursor batch / Parquet file
+    
+    Returns:
+        Collection, rows exported, files written, partitions touched and the new high-water mark
+    
+    Raises:
+        ValueError: If the collection isn't exportable
+        RuntimeError: If pyarrow isn't installed
+    """
+    if collection not in EXPORT_SOURCES:
+        raise ValueError(f'Collection {collection} is not exportable')
+    if not PARQUET_AVAILABLE:
+        raise RuntimeError('Parquet export requires pyarrow (pip install pyarrow)')
+    
+    time_field, id_field = EXPORT_SOURCES[collection]
+    export_dir = Path(export_dir or EXPORT_DIR)
+    
+    state = await db.export_state.find_one({'_id': collection}) or {}
+    
+    query = {time_field: {'$lte': datetime.utcnow() - timedelta(seconds=EXPORT_SETTLE_SECONDS)}}
+    if state.get('cursor'):
+        query = {'$and': [query, keyset_filter(time_field, 1, state['cursor'], id_field)]}
+    
+    cursor = db[collection].find(query, {'_id': 0}).sort(keyset_sort(time_field, 1, id_field)).batch_size(batch_size)
+    
+    run = datetime.utcnow().strftime('%Y%m%dT%H%M%S')
+    rows, files, partitions = 0, [], set()
+    high_water_mark = state.get('last_value')
+    batch_number = 0
+    
+    async def flush(batch: List[Dict]):
+        nonlocal rows, high_water_mark, batch_number
+        paths = await asyncio.to_thread(
+            _write_partitions, batch, collection, time_field, export_dir, f'part-{run}-{batch_number:05d}'
+        )
+        files.extend(paths)
+        partitions.update(Path(path).parent.name for path in paths)
+        
+        last = batch[-1]
+        high_water_mark = last[time_field]
+        rows += len(batch)
+        batch_number += 1
+        await db.export_state.update_one(
+            {'_id': collection},
+            {
+                '$set': {
+                    'cursor': encode_cursor(last[time_field], last[id_field]),
+                    'last_value': last[time_field],
+                    'updated_at': datetime.utcnow()
+                },
+                '$inc': {'rows_exported': len(batch)}
+            },
+            upsert=True
+        )
+    
+    batch = []
+    async for document in cursor:
+        batch.append(document)
+        if len(batch) == batch_size:
+            await flush(batch)
+            batch = []
+    if batch:
+        await flush(batch)
+    
+    logger.info(f"Exported {rows} {collection} rows to {len(files)} Parquet files")
+    
+    return {
+        'collection': collection,
+        'rows': rows,
+        'files': files,
+        'partitions': sorted(partitions),
+        'high_water_mark': high_water_mark
+    }
+
+async def export_collections(db, collections: Optional[List[str]] = None, export_dir: Optional[Path] = None) -> List[Dict]:
+    """Export several collections (default: every EXPORT_SOURCES collection)"""
+    return [
+        await export_collection(db, collection, export_dir)
+        for collection in (collections or list(EXPORT_SOURCES))
+    ]
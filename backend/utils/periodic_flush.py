@@ -0,0 +1,45 @@
+"""
+Periodic background flushing
+Base class for write-behind buffers that collect writes in memory and flush
+them on an interval, plus once more on application shutdown
+"""
+
+from typing import Optional
+import asyncio
+
+class PeriodicFlusher:
+    """
+    Runs `flush(db)` every `flush_interval` seconds once started
+    
+    Subclasses implement flush(); start() and stop() are wired to the
+    application's startup and shutdown hooks.
+    """
+    
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._task: Optional[asyncio.Task] = None
+    
+    async def flush(self, db) -> int:
+        """Write everything buffered; returns the number of documents written"""
+        raise NotImplementedError
+    
+    async def _flush_periodically(self, db):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush(db)
+    
+    def start(self, db):
+        """Start flushing in the background (called on application startup)"""
+        if self._task is None:
+            self._task = asyncio.ensure_future(self._flush_periodically(db))
+    
+    async def stop(self, db):
+        """Stop the background flusher and write what's left (called on application shutdown)"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush(db)
@@ -0,0 +1,164 @@
+"""
+Skill dictionary
+Maps normalized skill names and their aliases ("js" -> "javascript") to
+interned integer IDs, so skill matching is an integer set intersection
+instead of string set operations
+"""
+
+from typing import List, Dict, Iterable, Optional
+import hashlib
+import json
+import logging
+import os
+
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+logger = logging.getLogger(__name__)
+
+# Alias -> canonical skill name (both normalized)
+DEFAULT_SKILL_ALIASES = {
+    'js': 'javascript',
+    'ecmascript': 'javascript',
+    'ts': 'typescript',
+    'py': 'python',
+    'python3': 'python',
+    'golang': 'go',
+    'node': 'node.js',
+    'nodejs': 'node.js',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'nextjs': 'next.js',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'angularjs': 'angular',
+    'postgres': 'postgresql',
+    'mongo': 'mongodb',
+    'k8s': 'kubernetes',
+    'amazon web services': 'aws',
+    'google cloud': 'gcp',
+    'google cloud platform': 'gcp',
+    'ml': 'machine learning',
+    'c sharp': 'c#',
+    'cpp': 'c++',
+}
+
+def _load_aliases() -> Dict[str, str]:
+    """Default aliases, extended/overridden by the JSON file in SKILL_ALIASES_FILE"""
+    aliases = dict(DEFAULT_SKILL_ALIASES)
+    aliases_file = os.environ.get('SKILL_ALIASES_FILE')
+    if aliases_file:
+        try:
+            with open(aliases_file) as f:
+                aliases.update(json.load(f))
+        except Exception as e:
+            logger.error(f"Failed to load skill aliases from {aliases_file}: {str(e)}")
+    return {alias.lower().strip(): name.lower().strip() for alias, name in aliases.items()}
+
+def _aliases_hash(aliases: Dict[str, str]) -> str:
+    """Short fingerprint of an alias map (changes whenever any alias does)"""
+    payload = json.dumps(sorted(aliases.items()), separators=(',', ':'))
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]
+
+class SkillDictionary:
+    """
+    Interned skill IDs backed by the `skill_dictionary` collection
+    
+    The database owns the ID space so IDs stored on profiles and jobs are
+    the same in every server process; each process keeps a local mirror.
+    Async write paths call intern() so the mirror holds every name before
+    the synchronous scoring code looks it up. Without a database (scripts,
+    benchmarks) IDs are assigned locally instead.
+    """
+    
+    def __init__(self, aliases: Optional[Dict[str, str]] = None):
+        self.aliases = _load_aliases() if aliases is None else aliases
+        self.aliases_hash = _aliases_hash(self.aliases)
+        self.ids: Dict[str, int] = {}
+        self.names: Dict[int, str] = {}
+        self.db_backed = False
+    
+    def canonical(self, name: str) -> str:
+        """Normalize a skill name and resolve aliases"""
+        normalized = name.lower().strip()
+        return self.aliases.get(normalized, normalized)
+    
+    def _add(self, name: str, skill_id: int):
+        self.ids[name] = skill_id
+        self.names[skill_id] = name
+    
+    def get_id(self, name: str) -> Optional[int]:
+        """ID of a skill name, or None if it has never been interned"""
+        canonical = self.canonical(name)
+        skill_id = self.ids.get(canonical)
+        if skill_id is None and not self.db_backed:
+            skill_id = len(self.ids) + 1
+            self._add(canonical, skill_id)
+        return skill_id
+    
+    def get_ids(self, names: Iterable[str]) -> List[int]:
+        """Unique IDs of skill names, in first-seen order; unknown names are skipped"""
+        skill_ids = []
+        for name in names:
+            skill_id = self.get_id(name)
+            if skill_id is not None and skill_id not in skill_ids:
+                skill_ids.append(skill_id)
+        return skill_ids
+    
+    async def load(self, db):
+        """Load the whole dictionary into the local mirror"""
+        entries = await db.skill_dictionary.find({}, {'_id': 0, 'name': 1, 'skill_id': 1}).to_list(None)
+        for entry in entries:
+            self._add(entry['name'], entry['skill_id'])
+        self.db_backed = True
+        logger.info(f"Skill dictionary loaded: {len(self.ids)} skills")
+    
+    async def intern(self, db, names: Iterable[str], allocate: bool = True) -> List[int]:
+        """
+        Make sure skill names have IDs, allocating new ones in the database
+        
+        Args:
+            db: Database handle
+            names: Skill names (raw or normalized)
+            allocate: Allocate IDs for unknown names; when False (e.g. for
+                search terms) only names interned elsewhere are picked up
+        
+        Returns:
+            Unique skill IDs, in first-seen order (unknown names skipped if not allocating)
+        """
+        self.db_backed = True
+        canonical_names = [self.canonical(name) for name in names]
+        missing = list(dict.fromkeys(name for name in canonical_names if name not in self.ids))
+        
+        if missing:
+            # Pick up names interned by other processes first
+            entries = await db.skill_dictionary.find(
+                {'name': {'$in': missing}},
+                {'_id': 0, 'name': 1, 'skill_id': 1}
+            ).to_list(None)
+            for entry in entries:
+                self._add(entry['name'], entry['skill_id'])
+            missing = [name for name in missing if name not in self.ids]
+        
+        if missing and allocate:
+            # Allocate a block of IDs in one round trip
+            counter = await db.counters.find_one_and_update(
+                {'_id': 'skill_id'},
+                {'$inc': {'seq': len(missing)}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            first_id = counter['seq'] - len(missing) + 1
+            for offset, name in enumerate(missing):
+                try:
+                    await db.skill_dictionary.insert_one({'name': name, 'skill_id': first_id + offset})
+                    self._add(name, first_id + offset)
+                except DuplicateKeyError:
+                    # Another process interned the same name concurrently
+                    entry = await db.skill_dictionary.find_one({'name': name})
+                    self._add(entry['name'], entry['skill_id'])
+        
+        return self.get_ids(canonical_names)
+
+# Shared per-process dictionary
+skill_dictionary = SkillDictionary()
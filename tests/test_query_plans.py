@@ -0,0 +1,396 @@
+"""
+Query plan regression tests
+Runs the filter shape of each route (job search, credit transactions,
+applications, job rankings, talent search, sessions) through MongoDB explain() on seeded
+data with the registry indexes, and fails when a plan falls back to a
+collection scan or an in-memory sort.
+
+Needs a MongoDB server: TEST_MONGO_URL (or MONGO_URL). A throwaway database
+is created and dropped; the tests are skipped when no server is reachable.
+"""
+
+import asyncio
+import os
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+pymongo = pytest.importorskip('pymongo')
+motor_asyncio = pytest.importorskip('motor.motor_asyncio')
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / 'backend'
+sys.path.insert(0, str(BACKEND_DIR))
+
+import routes.jobs as jobs_routes  # noqa: E402
+from routes.jobs import build_job_search_filter, build_job_search_pipeline  # noqa: E402
+from routes.credits import build_transaction_query  # noqa: E402
+from routes.profile import build_jobseeker_search_filter, JOBSEEKER_SEARCH_SORTS  # noqa: E402
+from utils.indexes import ensure_indexes  # noqa: E402
+from utils.job_rankings import build_ranking_query, JOB_RANKING_SORT  # noqa: E402
+from utils.pagination import encode_cursor  # noqa: E402
+from utils.skill_dictionary import skill_dictionary  # noqa: E402
+
+MONGO_URL = os.environ.get('TEST_MONGO_URL') or os.environ.get('MONGO_URL')
+DB_NAME = f"talenthub_query_plans_{uuid.uuid4().hex[:8]}"
+
+SKILLS = ['python', 'javascript', 'react', 'aws', 'docker', 'sql', 'java', 'go', 'kubernetes', 'figma']
+CITIES = ['Bangalore', 'Pune', 'Mumbai', 'Delhi', 'Hyderabad', 'Chennai']
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli']
+NOW = datetime.utcnow()
+
+def _server_available() -> bool:
+    if not MONGO_URL:
+        return False
+    try:
+        pymongo.MongoClient(MONGO_URL, serverSelectionTimeoutMS=2000).admin.command('ping')
+        return True
+    except Exception:
+        return False
+
+pytestmark = pytest.mark.skipif(not _server_available(), reason='No MongoDB server (set TEST_MONGO_URL)')
+
+def _run_with_motor(fn):
+    """Run an async function against the test database through Motor, like the routes do"""
+    async def run():
+        client = motor_asyncio.AsyncIOMotorClient(MONGO_URL)
+        try:
+            return await fn(client[DB_NAME])
+        finally:
+            client.close()
+    return asyncio.run(run())
+
+# ==================== Seed Data ====================
+
+def _seed(db, rng: random.Random):
+    user_ids = [str(uuid.uuid4()) for _ in range(40)]
+    
+    jobs = []
+    for i in range(400):
+        skills = rng.sample(SKILLS, 3)
+        jobs.append({
+            'id': str(uuid.uuid4()),
+            'employer_id': rng.choice(user_ids),
+            'job_title': f"{rng.choice(['Senior', 'Junior', 'Lead'])} {rng.choice(['Backend', 'Frontend', 'Data'])} Engineer",
+            'description': f"Work with {' and '.join(skills)} on {rng.choice(['payments', 'search', 'analytics'])}",
+            'company_name': rng.choice(COMPANIES),
+            'location': rng.choice(CITIES),
+            'job_type': rng.choice(['full_time', 'part_time', 'contract']),
+            'work_mode': rng.choice(['remote', 'hybrid', 'onsite']),
+            'min_experience': rng.randint(0, 8),
+            'max_experience': rng.randint(8, 15),
+            'min_salary': rng.randrange(300000, 3000000, 50000),
+            'required_skills': skills,
+            'required_skill_ids': skill_dictionary.get_ids(skills),
+            'status': 'active' if i % 10 else 'closed',
+            'created_at': NOW - timedelta(hours=i)
+        })
+    db.jobs.insert_many(jobs)
+    
+    # Distinct (job, job seeker) pairs: the registry's unique index allows one application each
+    pairs = rng.sample([(job['id'], user_id) for job in jobs for user_id in user_ids], 600)
+    db.job_applications.insert_many([
+        {
+            'id': str(uuid.uuid4()),
+            'job_id': job_id,
+            'job_seeker_id': job_seeker_id,
+            'status': 'pending',
+            'applied_at': NOW - timedelta(minutes=i)
+        }
+        for i, (job_id, job_seeker_id) in enumerate(pairs)
+    ])
+    
+    # Materialized rankings of the applicants, with tied scores
+    rankings = [
+        {
+            'job_id': job_id,
+            'candidate_id': job_seeker_id,
+            'overall_score': float(rng.choice(range(40, 100, 5))),
+            'updated_at': NOW
+        }
+        for job_id, job_seeker_id in pairs
+    ]
+    db.job_rankings.insert_many(rankings)
+    
+    db.jobseeker_profiles.insert_many([
+        {
+            'user_id': user_id,
+            'first_name': f"Name{i}",
+            'last_name': f"Surname{i}",
+            'current_position': rng.choice(['Engineer', 'Designer', 'Analyst']),
+            'current_company': rng.choice(COMPANIES),
+            'location': rng.choice(CITIES),
+            'experience_years': rng.randint(0, 20),
+            'primary_skills': rng.sample(SKILLS, 3),
+            'verification_status': rng.choice(['verified', 'unverified']),
+            'overall_rating': round(rng.uniform(1, 5), 1),
+            'verification_count': rng.randint(0, 10),
+            'updated_at': NOW - timedelta(hours=i)
+        }
+        for i, user_id in enumerate([str(uuid.uuid4()) for _ in range(300)])
+    ])
+    
+    db.credit_transactions.insert_many([
+        {
+            'id': str(uuid.uuid4()),
+            'user_id': rng.choice(user_ids),
+            'amount': rng.randint(1, 50),
+            'transaction_type': rng.choice(['earn', 'spend', 'bonus', 'admin_add']),
+            'category': rng.choice(['signup_bonus', 'contact_reveal', 'interview_request']),
+            'created_at': NOW - timedelta(minutes=i)
+        }
+        for i in range(800)
+    ])
+    
+    sessions = [
+        {
+            'session_id': str(uuid.uuid4()),
+            'user_id': rng.choice(user_ids),
+            'is_active': rng.random() < 0.5,
+            'expires_at': NOW + timedelta(days=rng.randint(1, 30))
+        }
+        for _ in range(300)
+    ]
+    db.user_sessions.insert_many(sessions)
+    
+    db.login_history.insert_many([
+        {
+            'history_id': str(uuid.uuid4()),
+            'session_id': session['session_id'],
+            'user_id': session['user_id'],
+            'status': rng.choice(['success', 'failed', 'logged_out']),
+            'logout_time': None,
+            'login_time': NOW - timedelta(minutes=i)
+        }
+        for i, session in enumerate(sessions * 2)
+    ])
+    
+    return {
+        'user_id': user_ids[0],
+        'job': jobs[len(jobs) // 2],
+        'ranking': rankings[len(rankings) // 2],
+        'session': sessions[0]
+    }
+
+@pytest.fixture(scope='module')
+def plan_db():
+    client = pymongo.MongoClient(MONGO_URL)
+    db = client[DB_NAME]
+    
+    async def prepare(motor_db):
+        report = await ensure_indexes(motor_db)
+        failed = [entry for entry in report if entry['status'] in ('failed', 'conflict')]
+        assert not failed, f"Index registry could not be applied: {failed}"
+        await skill_dictionary.intern(motor_db, SKILLS)
+    
+    _run_with_motor(prepare)
+    seeded = _seed(db, random.Random(17))
+    
+    yield db, seeded
+    
+    client.drop_database(DB_NAME)
+    client.close()
+
+# ==================== Plan Inspection ====================
+
+def _winning_stages(explain) -> list:
+    """Stage names of the winning plan(s), including pipeline stages left to the aggregation framework"""
+    stages = []
+    
+    def collect(node):
+        if isinstance(node, dict):
+            if isinstance(node.get('stage'), str):
+                stages.append(node['stage'])
+            for value in node.values():
+                collect(value)
+        elif isinstance(node, list):
+            for item in node:
+                collect(item)
+    
+    def walk(node):
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if key == 'winningPlan':
+                    collect(value)
+                elif key not in ('rejectedPlans', 'command'):
+                    walk(value)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item)
+    
+    walk(explain)
+    
+    # A $sort that couldn't be pushed down into the query runs in memory
+    for stage in explain.get('stages', []):
+        if '$sort' in stage:
+            stages.append('$sort')
+    
+    return stages
+
+def assert_indexed_plan(explain, allow_sort: bool = False):
+    stages = _winning_stages(explain)
+    assert stages, f"No winning plan found in explain output: {explain}"
+    assert 'COLLSCAN' not in stages, f"Plan uses a collection scan: {stages}"
+    if not allow_sort:
+        assert 'SORT' not in stages and '$sort' not in stages, f"Plan sorts in memory: {stages}"
+
+def explain_find(collection, query, sort=None, limit=50):
+    cursor = collection.find(query)
+    if sort:
+        cursor = cursor.sort(sort)
+    return cursor.limit(limit).explain()
+
+# ==================== Job Search ====================
+
+# (search parameters, sort_by, allow in-memory sort). Text and skill matches
+# are narrowed through their own indexes, so ordering the (bounded) match set
+# is expected to happen in memory there
+JOB_SEARCH_CASES = [
+    ({}, 'created_at', False),
+    ({}, 'min_salary', False),
+    ({'job_type': 'full_time', 'work_mode': 'remote'}, 'created_at', False),
+    ({'location': 'pune'}, 'created_at', False),
+    ({'company': 'acme'}, 'created_at', False),
+    ({'min_experience': 3, 'max_experience': 10}, 'created_at', False),
+    ({'min_salary': 1500000}, 'min_salary', False),
+    ({'freshness': 7}, 'created_at', False),
+    ({'query': '"backend engineer"'}, 'created_at', False),
+    ({'skills': 'python,aws'}, 'created_at', True),
+    ({'query': 'python'}, 'relevance', True),
+    ({'query': 'python'}, 'created_at', True),
+]
+
+def _job_search_pipeline(monkeypatch, params, sort_by, cursor=None, compute_summary=False):
+    """The aggregation run_job_search runs for these parameters"""
+    async def build(motor_db):
+        monkeypatch.setattr(jobs_routes, 'db', motor_db)
+        filter_query, text_scored = await build_job_search_filter(**params)
+        return build_job_search_pipeline(filter_query, text_scored, sort_by, 1, 20, cursor, compute_summary)
+    
+    pipeline, _ = _run_with_motor(build)
+    return pipeline
+
+@pytest.mark.parametrize('compute_summary', [False, True], ids=['page', 'with_summary'])
+@pytest.mark.parametrize('params,sort_by,allow_sort', JOB_SEARCH_CASES)
+def test_job_search_plan(plan_db, monkeypatch, params, sort_by, allow_sort, compute_summary):
+    db, _ = plan_db
+    pipeline = _job_search_pipeline(monkeypatch, params, sort_by, compute_summary=compute_summary)
+    
+    explain = db.command('aggregate', 'jobs', pipeline=pipeline, explain=True)
+    assert_indexed_plan(explain, allow_sort=allow_sort)
+
+@pytest.mark.parametrize('compute_summary', [False, True], ids=['page', 'with_summary'])
+@pytest.mark.parametrize('sort_field', ['created_at', 'min_salary'])
+def test_job_search_cursor_plan(plan_db, monkeypatch, sort_field, compute_summary):
+    db, seeded = plan_db
+    job = seeded['job']
+    cursor = encode_cursor(job[sort_field], job['id'])
+    pipeline = _job_search_pipeline(monkeypatch, {}, sort_field, cursor=cursor, compute_summary=compute_summary)
+    
+    explain = db.command('aggregate', 'jobs', pipeline=pipeline, explain=True)
+    assert_indexed_plan(explain)
+
+def test_job_lookup_plan(plan_db):
+    db, seeded = plan_db
+    assert_indexed_plan(explain_find(db.jobs, {'id': seeded['job']['id']}, limit=1))
+
+# ==================== Credit Transactions ====================
+
+@pytest.mark.parametrize('params', [
+    {},
+    {'transaction_type': 'spend'},
+    {'category': 'contact_reveal'},
+    {'start_date': (NOW - timedelta(days=1)).isoformat(), 'end_date': NOW.isoformat()},
+])
+def test_transaction_history_plan(plan_db, params):
+    db, seeded = plan_db
+    query = build_transaction_query(seeded['user_id'], **params)
+    assert_indexed_plan(explain_find(db.credit_transactions, query, [('created_at', -1)]))
+
+@pytest.mark.parametrize('by_user,params', [
+    (False, {}),
+    (True, {}),
+    (False, {'transaction_type': 'admin_add'}),
+    (False, {'start_date': (NOW - timedelta(hours=3)).isoformat()}),
+])
+def test_admin_transactions_plan(plan_db, by_user, params):
+    db, seeded = plan_db
+    query = build_transaction_query(seeded['user_id'] if by_user else None, **params)
+    assert_indexed_plan(explain_find(db.credit_transactions, query, [('created_at', -1)]))
+
+# ==================== Applications ====================
+
+def test_my_applications_plan(plan_db):
+    db, seeded = plan_db
+    query = {'job_seeker_id': seeded['user_id']}
+    assert_indexed_plan(explain_find(db.job_applications, query, [('applied_at', -1)], limit=100))
+
+def test_job_applications_plan(plan_db):
+    db, seeded = plan_db
+    query = {'job_id': seeded['job']['id']}
+    assert_indexed_plan(explain_find(db.job_applications, query, [('applied_at', -1)], limit=100))
+
+def test_existing_application_plan(plan_db):
+    db, seeded = plan_db
+    query = {'job_id': seeded['job']['id'], 'job_seeker_id': seeded['user_id']}
+    assert_indexed_plan(explain_find(db.job_applications, query, limit=1))
+
+# ==================== Job Rankings ====================
+
+@pytest.mark.parametrize('with_cursor', [False, True], ids=['first_page', 'cursor'])
+def test_job_ranking_plan(plan_db, with_cursor):
+    db, seeded = plan_db
+    ranking = seeded['ranking']
+    cursor = encode_cursor(ranking['overall_score'], ranking['candidate_id']) if with_cursor else None
+    query = build_ranking_query(ranking['job_id'], cursor)
+    assert_indexed_plan(explain_find(db.job_rankings, query, JOB_RANKING_SORT, limit=21))
+
+# ==================== Talent Search ====================
+
+# Skill filters are excluded: primary_skills narrows through its own index,
+# leaving an in-memory sort of the match set
+@pytest.mark.parametrize('params,sort_by', [
+    ({}, 'relevance'),
+    ({}, 'recent'),
+    ({'query': 'engineer'}, 'relevance'),
+    ({'location': 'pune'}, 'recent'),
+    ({'verified_only': True}, 'relevance'),
+    ({'experience_min': 3, 'experience_max': 10}, 'experience'),
+])
+def test_talent_search_plan(plan_db, params, sort_by):
+    db, _ = plan_db
+    filters = build_jobseeker_search_filter(**params)
+    assert_indexed_plan(explain_find(db.jobseeker_profiles, filters, JOBSEEKER_SEARCH_SORTS[sort_by], limit=20))
+
+# ==================== Sessions ====================
+
+def test_active_sessions_plan(plan_db):
+    db, seeded = plan_db
+    query = {'user_id': seeded['session']['user_id'], 'is_active': True, 'expires_at': {'$gt': datetime.utcnow()}}
+    assert_indexed_plan(explain_find(db.user_sessions, query, limit=100))
+
+def test_session_lookup_plan(plan_db):
+    db, seeded = plan_db
+    session = seeded['session']
+    assert_indexed_plan(explain_find(db.user_sessions, {'session_id': session['session_id'], 'user_id': session['user_id']}, limit=1))
+    assert_indexed_plan(explain_find(db.login_history, {'session_id': session['session_id'], 'user_id': session['user_id']}, limit=1))
+
+def test_logout_all_plan(plan_db):
+    db, seeded = plan_db
+    user_id = seeded['session']['user_id']
+    assert_indexed_plan(explain_find(db.user_sessions, {'user_id': user_id, 'is_active': True}, limit=0))
+    assert_indexed_plan(explain_find(db.login_history, {'user_id': user_id, 'status': 'success', 'logout_time': None}, limit=0))
+
+@pytest.mark.parametrize('by_user,query', [
+    (True, {}),
+    (False, {}),
+    (False, {'status': 'failed'}),
+])
+def test_login_history_plan(plan_db, by_user, query):
+    db, seeded = plan_db
+    if by_user:
+        query = {**query, 'user_id': seeded['user_id']}
+    assert_indexed_plan(explain_find(db.login_history, query, [('login_time', -1)]))